@@ -20,6 +20,7 @@ from flask import (
     jsonify,
 )
 from flask.cli import with_appcontext
+from flask.json.provider import DefaultJSONProvider
 from flask_babel import Babel, lazy_gettext as _l
 from flask_bootstrap import Bootstrap
 from flask_limiter import Limiter
@@ -32,6 +33,11 @@ from flask_wtf.csrf import CSRFProtect, CSRFError
 
 from config import Config
 
+try:
+    import orjson
+except ImportError:  # optional speed-up; Flask's stdlib-based provider is used without it
+    orjson = None
+
 db = SQLAlchemy()
 migrate = Migrate()
 login = LoginManager()
@@ -99,6 +105,32 @@ def clean_dismissed_notifications(dry_run):
         )
 
 
+class ORJSONProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson that keeps Flask's default encoding rules."""
+
+    def dumps(self, obj, **kwargs):
+        sort_keys = kwargs.pop('sort_keys', self.sort_keys)
+        indent = kwargs.pop('indent', None)
+        separators = kwargs.pop('separators', None)
+        # response() asks for either compact separators or indent=2 (debug);
+        # orjson covers both, anything else goes through the stdlib provider
+        if kwargs or indent not in (None, 2) or separators not in (None, (',', ':')):
+            return super().dumps(obj, sort_keys=sort_keys, indent=indent, separators=separators, **kwargs)
+        # Hand datetimes and dataclasses to DefaultJSONProvider.default so the
+        # output matches the stdlib provider (HTTP dates rather than ISO strings)
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+
 def get_locale():
     """Get the best matching language for the user."""
     if 'language' in session:
@@ -114,6 +146,8 @@ def create_app(config_class=Config):
     app.config.from_object(config_class)
     app.secret_key = app.config['SECRET_KEY']  # Explicitly set secret_key
     app.logger.setLevel(app.config['LOG_LEVEL'])  # Set logging level from config
+    if orjson is not None:
+        app.json = ORJSONProvider(app)
 
     # Get version from VERSION file
     version_file = os.path.join(app.root_path, '..', 'VERSION')
@@ -1,4 +1,4 @@
-from flask import Blueprint, session, current_app # Import session, current_app
+from flask import Blueprint, session, current_app, make_response # Import session, current_app
 from flask_restx import Api
 from flask_login import current_user, login_user
 from app import login as login_manager # Import the login_manager instance
@@ -12,5 +12,17 @@ api = Api(bp,
           csrf_protect=False)
 
 
+@api.representation('application/json')
+def output_json(data, code, headers=None):
+    """Serialise API responses with the app's JSON provider (orjson when installed)."""
+    # flask-restx otherwise calls json.dumps directly; keep its model field order
+    # and its readable output in debug mode
+    dump_args = {'sort_keys': False}
+    if current_app.debug:
+        dump_args['indent'] = 2
+    resp = make_response(current_app.json.dumps(data, **dump_args) + "\n", code)
+    resp.headers.extend(headers or {})
+    return resp
+
 
 from app.api import routes
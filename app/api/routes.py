@@ -19,7 +19,7 @@ skill_model = api.model('Skill', {
     'name': fields.String(required=True, description='Skill name'),
     'description': fields.String(description='Skill description'),
     'validity_period_months': fields.Integer(description='Validity period in months'),
-    'complexity': fields.String(enum=[c.value for c in Complexity], description='Complexity level'),
+    'complexity': fields.String(enum=[str(c.value) for c in Complexity], description='Complexity level', attribute=lambda x: str(x.complexity.value) if x.complexity else None),
     'reference_urls_text': fields.String(description='Comma-separated reference URLs'),
     'protocol_attachment_path': fields.String(description='Path to protocol attachment'),
     'training_videos_urls_text': fields.String(description='Comma-separated training video URLs'),
@@ -59,6 +59,7 @@ training_path_model = api.model('TrainingPath', {
     'id': fields.Integer(readOnly=True),
     'name': fields.String(required=True, description='Training path name'),
     'description': fields.String(description='Training path description'),
+    'species_id': fields.Integer(required=True, description='ID of the species the path applies to'),
     'skill_ids': fields.List(fields.Integer, description='List of skill IDs in this path', attribute=lambda x: [s.id for s in x.skills]),
     'assigned_user_ids': fields.List(fields.Integer, description='List of user IDs assigned to this path', attribute=lambda x: [u.id for u in x.assigned_users]),
 })
@@ -100,7 +101,7 @@ training_request_model = api.model('TrainingRequest', {
     'id': fields.Integer(readOnly=True),
     'requester_id': fields.Integer(required=True, description='ID of the requester'),
     'request_date': fields.DateTime(dt_format='iso8601', description='Request date (ISO 8601)'),
-    'status': fields.String(enum=[s.value for s in TrainingRequestStatus], description='Request status'),
+    'status': fields.String(enum=[s.value for s in TrainingRequestStatus], description='Request status', attribute=lambda x: x.status.value if x.status else None),
     'skills_requested_ids': fields.List(fields.Integer, description='List of requested skill IDs', attribute=lambda x: [s.id for s in x.skills_requested]),
 })
 
@@ -110,7 +111,7 @@ external_training_model = api.model('ExternalTraining', {
     'external_trainer_name': fields.String(description='Name of the external trainer'),
     'date': fields.DateTime(dt_format='iso8601', description='Date of external training (ISO 8601)'),
     'attachment_path': fields.String(description='Path to attachment'),
-    'status': fields.String(enum=[s.value for s in ExternalTrainingStatus], description='Status of external training'),
+    'status': fields.String(enum=[s.value for s in ExternalTrainingStatus], description='Status of external training', attribute=lambda x: x.status.value if x.status else None),
     'validator_id': fields.Integer(description='ID of the validator'),
     'skills_claimed_ids': fields.List(fields.Integer, description='List of claimed skill IDs', attribute=lambda x: [s.skill_id for s in x.skill_claims]),
 })
@@ -145,6 +146,18 @@ declare_practice_public_payload = api.model('DeclarePracticePublicPayload', {
 })
 
 
+def parse_enum(enum_class, raw):
+    """Look an enum member up by the value the API returns, falling back to its name."""
+    try:
+        return enum_class(raw)
+    except ValueError:
+        pass
+    try:
+        return enum_class[raw.upper()]
+    except (KeyError, AttributeError):
+        api.abort(400, f"Invalid {enum_class.__name__} value: {raw}")
+
+
 # API Key Authentication
 def token_required(f):
     @api.doc(security='apikey')
@@ -519,7 +532,7 @@ class TrainingPathList(Resource):
         """List all training paths"""
         return TrainingPath.query.all()
 
-    @api.expect(training_path_model)
+    @api.expect(training_path_model, validate=True)
     @api.marshal_with(training_path_model, code=201)
     @api.doc(security='apikey')
     @token_required
@@ -527,7 +540,7 @@ class TrainingPathList(Resource):
     def post(self):
         """Create a new training path"""
         data = api.payload
-        training_path = TrainingPath(name=data['name'], description=data.get('description'))
+        training_path = TrainingPath(name=data['name'], description=data.get('description'), species_id=data['species_id'])
         
         if 'skill_ids' in data:
             training_path.skills = Skill.query.filter(Skill.id.in_(data['skill_ids'])).all()
@@ -561,6 +574,7 @@ class TrainingPathResource(Resource):
         data = api.payload
         training_path.name = data['name']
         training_path.description = data.get('description', training_path.description)
+        training_path.species_id = data.get('species_id', training_path.species_id)
 
         if 'skill_ids' in data:
             training_path.skills = Skill.query.filter(Skill.id.in_(data['skill_ids'])).all()
@@ -861,7 +875,7 @@ class TrainingRequestList(Resource):
         training_request = TrainingRequest(
             requester_id=data['requester_id'],
             request_date=datetime.fromisoformat(data['request_date']) if 'request_date' in data else datetime.now(timezone.utc),
-            status=TrainingRequestStatus[data['status'].upper()] if 'status' in data else TrainingRequestStatus.PENDING
+            status=parse_enum(TrainingRequestStatus, data['status']) if 'status' in data else TrainingRequestStatus.PENDING
         )
         if 'skills_requested_ids' in data:
             training_request.skills_requested = Skill.query.filter(Skill.id.in_(data['skills_requested_ids'])).all()
@@ -893,7 +907,7 @@ class TrainingRequestResource(Resource):
         data = api.payload
         training_request.requester_id = data['requester_id']
         training_request.request_date = datetime.fromisoformat(data['request_date']) if 'request_date' in data else training_request.request_date
-        training_request.status = TrainingRequestStatus[data['status'].upper()] if 'status' in data else training_request.status
+        training_request.status = parse_enum(TrainingRequestStatus, data['status']) if 'status' in data else training_request.status
 
         if 'skills_requested_ids' in data:
             training_request.skills_requested = Skill.query.filter(Skill.id.in_(data['skills_requested_ids'])).all()
@@ -936,7 +950,7 @@ class ExternalTrainingList(Resource):
             external_trainer_name=data.get('external_trainer_name'),
             date=datetime.fromisoformat(data['date']) if 'date' in data else datetime.now(timezone.utc),
             attachment_path=data.get('attachment_path'),
-            status=ExternalTrainingStatus[data['status'].upper()] if 'status' in data else ExternalTrainingStatus.PENDING
+            status=parse_enum(ExternalTrainingStatus, data['status']) if 'status' in data else ExternalTrainingStatus.PENDING
         )
         if 'validator_id' in data:
             external_training.validator = User.query.get(data['validator_id'])
@@ -972,7 +986,7 @@ class ExternalTrainingResource(Resource):
         external_training.external_trainer_name = data.get('external_trainer_name', external_training.external_trainer_name)
         external_training.date = datetime.fromisoformat(data['date']) if 'date' in data else external_training.date
         external_training.attachment_path = data.get('attachment_path', external_training.attachment_path)
-        external_training.status = ExternalTrainingStatus[data['status'].upper()] if 'status' in data else external_training.status
+        external_training.status = parse_enum(ExternalTrainingStatus, data['status']) if 'status' in data else external_training.status
 
         if 'validator_id' in data:
             external_training.validator = User.query.get(data['validator_id'])
@@ -1014,7 +1028,7 @@ class SkillListResource(Resource):
         data = api.payload
         skill = Skill(name=data['name'], description=data.get('description'),
                       validity_period_months=data.get('validity_period_months'),
-                      complexity=Complexity[data['complexity'].upper()],
+                      complexity=parse_enum(Complexity, data['complexity']),
                       reference_urls_text=data.get('reference_urls_text'),
                       protocol_attachment_path=data.get('protocol_attachment_path'),
                       training_videos_urls_text=data.get('training_videos_urls_text'),
@@ -1184,7 +1198,7 @@ class SkillResource(Resource):
         skill.name = data['name']
         skill.description = data.get('description', skill.description)
         skill.validity_period_months = data.get('validity_period_months', skill.validity_period_months)
-        skill.complexity = Complexity[data['complexity'].upper()]
+        skill.complexity = parse_enum(Complexity, data['complexity'])
         skill.reference_urls_text = data.get('reference_urls_text', skill.reference_urls_text)
         skill.protocol_attachment_path = data.get('protocol_attachment_path', skill.protocol_attachment_path)
         skill.training_videos_urls_text = data.get('training_videos_urls_text', skill.training_videos_urls_text)
@@ -477,7 +477,9 @@ class User(UserMixin, db.Model):
         """
         Sets the user's password by hashing it.
         """
-        self.password_hash = generate_password_hash(password)
+        from app import current_app
+        method = current_app.config.get('PASSWORD_HASH_METHOD', 'scrypt')
+        self.password_hash = generate_password_hash(password, method=method)
 
     def check_password(self, password):
         """
@@ -643,12 +645,15 @@ def init_roles_and_permissions():
          'category': 'Reporting'},
     ]
 
+    # Load existing permissions once instead of probing each name
+    permissions_by_name = {p.name: p for p in Permission.query.all()}
     for p_data in permissions_data:
-        permission = Permission.query.filter_by(name=p_data['name']).first()
+        permission = permissions_by_name.get(p_data['name'])
         if not permission:
             permission = Permission(name=p_data['name'], description=p_data['description'],
                                     category=p_data['category'])
             db.session.add(permission)
+            permissions_by_name[permission.name] = permission
         else:
             # Update existing permission's description and category if they changed
             if permission.description != p_data['description']:
@@ -685,8 +690,9 @@ def init_roles_and_permissions():
         ]
     }
 
+    roles_by_name = {r.name: r for r in Role.query.all()}
     for r_name, p_names in roles_data.items():
-        role = Role.query.filter_by(name=r_name).first()
+        role = roles_by_name.get(r_name)
         if not role:
             role = Role(name=r_name, description=f'{r_name} role')
             db.session.add(role)
@@ -695,7 +701,7 @@ def init_roles_and_permissions():
         # Clear existing permissions and re-add to ensure consistency
         role.permissions = []
         for p_name in p_names:
-            permission = Permission.query.filter_by(name=p_name).first()
+            permission = permissions_by_name.get(p_name)
             if permission and permission not in role.permissions:
                 role.permissions.append(permission)
     db.session.commit()
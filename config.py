@@ -58,6 +58,9 @@ class Config:
     if SESSION_COOKIE_SAMESITE.lower() == 'none':
         SESSION_COOKIE_SAMESITE = None
 
+    # Password hashing method passed to werkzeug's generate_password_hash
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt')
+
     # Logging Level
     LOG_LEVEL = os.environ.get('APP_LOG_LEVEL') or os.environ.get('LOG_LEVEL') or 'INFO' # Default to INFO
 
@@ -5,13 +5,17 @@ Handles setup, deployment, and maintenance operations with comprehensive feature
 """
 
 import argparse
+import ctypes
+import functools
 import os
+import select
 import secrets
 import shutil
 import subprocess
 import sys
 import time
 import platform
+import re
 import getpass
 from pathlib import Path
 from datetime import datetime
@@ -22,6 +26,10 @@ ENV_SAMPLE = "env-sample"
 REQUIRED_DIRS = ["instance", "logs", "migrations"]
 BANNER_WIDTH = 60
 IS_WINDOWS = os.name == 'nt'
+DOCKER_SOCKET = "/var/run/docker.sock"
+DOCKER_PIPE = r'\\.\pipe\docker_engine'
+PID_RE = re.compile(r'\b\d+\b')
+_NETSTAT_RE_CACHE = {}  # port -> compiled "netstat -ano" LISTENING row pattern
 
 # --- Colors ---
 class Colors:
@@ -53,6 +61,37 @@ class Colors:
     def warning(text): Colors.print_msg(f"[!] {text}", Colors.WARNING)
 
 # --- Helpers ---
+def _cache_key(value):
+    """Hashable stand-in for an argument; config dicts are keyed by their items."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _cache_key(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_cache_key(v) for v in value)
+    return value
+
+def ttl_cache(seconds):
+    """Cache a function's result per arguments for a few seconds.
+    
+    The wrapped function gets a cache_clear() method for explicit invalidation.
+    """
+    def decorator(func):
+        entries = {}  # key -> (value, expires_at)
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (_cache_key(args), _cache_key(kwargs))
+            now = time.monotonic()
+            entry = entries.get(key)
+            if entry and entry[1] > now:
+                return entry[0]
+            value = func(*args, **kwargs)
+            entries[key] = (value, now + seconds)
+            return value
+        
+        wrapper.cache_clear = entries.clear
+        return wrapper
+    return decorator
+
 def run_command(cmd, check=True, capture_output=False, shell=True, env=None):
     """Run a shell command with proper error handling."""
     try:
@@ -68,28 +107,118 @@ def run_command(cmd, check=True, capture_output=False, shell=True, env=None):
             print(f"Stderr: {e.stderr}")
         if check:
             sys.exit(1)
+    except FileNotFoundError:
+        # Only reachable with shell=False (argv list)
+        Colors.error(f"Command not found: {cmd[0]}")
+        if check:
+            sys.exit(1)
 
-def check_docker():
-    """Check if Docker is running."""
+def _docker_ping():
+    """Ping the local Docker daemon over its socket/pipe (GET /_ping).
+    
+    Returns True/False, or None when only the docker CLI knows how to reach
+    the daemon: DOCKER_HOST is set, or there is no default socket/pipe
+    (Docker Desktop for Linux, rootless Docker, Colima, other contexts).
+    """
+    if os.environ.get('DOCKER_HOST'):
+        return None
+    request = b"GET /_ping HTTP/1.0\r\nHost: docker\r\n\r\n"
+    try:
+        if IS_WINDOWS:
+            with open(DOCKER_PIPE, 'r+b', buffering=0) as pipe:
+                pipe.write(request)
+                response = pipe.read(64)
+        else:
+            import socket
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+                s.settimeout(2)
+                s.connect(DOCKER_SOCKET)
+                s.sendall(request)
+                response = s.recv(64)
+    except FileNotFoundError:
+        return None
+    except OSError:
+        # The socket exists but refused us (daemon down, no permission)
+        return False
+    status_line = response.split(b"\r\n", 1)[0].split()
+    return len(status_line) >= 2 and status_line[1] == b"200"
+
+@ttl_cache(5)
+def docker_daemon_running():
+    """Check whether the Docker daemon answers (result cached for 5s)."""
+    ping = _docker_ping()
+    if ping is not None:
+        return ping
     try:
-        run_command("docker info", capture_output=True)
+        subprocess.run(["docker", "info"], capture_output=True, check=True, timeout=5)
         return True
     except:
-        Colors.error("Docker is not running or not accessible. Please start Docker first.")
         return False
 
+_docker_checked = False
+
+def check_docker():
+    """Check if Docker is running."""
+    global _docker_checked
+    if _docker_checked:
+        return True
+    if docker_daemon_running():
+        _docker_checked = True
+        return True
+    Colors.error("Docker is not running or not accessible. Please start Docker first.")
+    return False
+
+def _logs_dir_snapshot():
+    """Map file names in logs/ to their DirEntry with a single directory scan."""
+    try:
+        with os.scandir("logs") as it:
+            return {entry.name: entry for entry in it}
+    except FileNotFoundError:
+        return {}
+
+def _read_pidfile(path):
+    """Read a PID file with a single raw read (int() accepts the bytes directly)."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return int(os.read(fd, 32))
+    finally:
+        os.close(fd)
+
+def _write_small_file(path, text):
+    """Replace a tiny file's contents with one raw write."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, text.encode())
+    finally:
+        os.close(fd)
+
+def _missing_dirs():
+    """Return the REQUIRED_DIRS absent from the current directory (one scan)."""
+    with os.scandir('.') as it:
+        present = {entry.name for entry in it if entry.is_dir()}
+    return [d for d in REQUIRED_DIRS if d not in present]
+
 def ensure_dirs():
     """Create required directories."""
-    for d in REQUIRED_DIRS:
-        if not os.path.exists(d):
-            os.makedirs(d)
-            Colors.info(f"Created directory: {d}")
+    for d in _missing_dirs():
+        os.makedirs(d, exist_ok=True)
+        Colors.info(f"Created directory: {d}")
 
 # --- Enhanced Utilities ---
 
 class PortManager:
     """Advanced port management with availability checking and conflict resolution."""
     
+    @staticmethod
+    def _netstat_listen_re(port):
+        """Compiled pattern for netstat LISTENING rows on exactly this port (PID in group 1)."""
+        port = int(port)
+        pattern = _NETSTAT_RE_CACHE.get(port)
+        if pattern is None:
+            pattern = _NETSTAT_RE_CACHE[port] = re.compile(
+                rf'^\s*TCP\s+\S+:{port}\s+\S+\s+LISTENING\s+(\d+)\s*$', re.M)
+        return pattern
+    
     @staticmethod
     def check_port_available(port, host='localhost'):
         """Check if a port is available."""
@@ -127,29 +256,24 @@ class PortManager:
     def get_port_owner(port):
         """Identify which process is using the port."""
         if IS_WINDOWS:
-             # First find PID using the port, filtering for LISTENING
-             # We use findstr to look for the port AND "LISTENING"
-             # Since findstr doesn't support AND easily on one line without regex, we pipe.
-             cmd = f'netstat -ano | findstr :{port} | findstr LISTENING'
-             res = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-             if not res.stdout: return None
-             
-             # Extract PID (last column of the first matching line)
+             # One regex pass over the whole table: only LISTENING rows whose local
+             # port is exactly this one (findstr :5001 would also match :50010)
              try:
-                 # Take the first line only to avoid confusion if multiple interfaces listen
-                 first_line = res.stdout.strip().split('\n')[0]
-                 parts = first_line.split()
-                 pid = parts[-1]
-                 if pid.isdigit():
-                     return int(pid)
-             except:
-                 pass
+                 res = subprocess.run(['netstat', '-ano'], capture_output=True, text=True)
+             except FileNotFoundError:
+                 return None
+             match = PortManager._netstat_listen_re(port).search(res.stdout)
+             if match:
+                 return int(match.group(1))
         else:
             # Linux
-            cmd = f"lsof -t -i:{port}"
-            res = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-            if res.stdout.strip():
-                return int(res.stdout.strip().split('\n')[0])
+            try:
+                res = subprocess.run(['lsof', '-t', f'-i:{port}'], capture_output=True, text=True)
+            except FileNotFoundError:
+                return None
+            match = PID_RE.search(res.stdout)
+            if match:
+                return int(match.group())
         return None
 
     @staticmethod
@@ -160,10 +284,11 @@ class PortManager:
         
         # 1. Check direct PID match from files
         native_pids = []
-        for pf in ["logs/app.pid", "logs/gunicorn.pid"]:
-            if os.path.exists(pf):
+        entries = _logs_dir_snapshot()
+        for name in ("app.pid", "gunicorn.pid"):
+            if name in entries:
                 try: 
-                    with open(pf) as f: native_pids.append(int(f.read().strip()))
+                    native_pids.append(_read_pidfile(entries[name].path))
                 except: pass
                 
         if owner_pid in native_pids:
@@ -293,12 +418,30 @@ class DatabaseManager:
 class ConfigManager:
     """Manage .env configuration file."""
     
+    # Parsed .env contents, keyed on the file's (mtime_ns, size)
+    _env_cache = {'stamp': None, 'data': None}
+    
     @staticmethod
     def load_env():
-        """Load .env file into dictionary."""
+        """Load .env file into dictionary (cached until the file changes)."""
+        cache = ConfigManager._env_cache
+        try:
+            st = os.stat(ENV_FILE)
+        except OSError:
+            return {}
+        stamp = (st.st_mtime_ns, st.st_size)
+        if cache['stamp'] != stamp:
+            cache['data'] = ConfigManager.load_file(ENV_FILE)
+            cache['stamp'] = stamp
+        # Callers mutate the result before save_env(), so hand out a copy
+        return dict(cache['data'])
+    
+    @staticmethod
+    def load_file(path):
+        """Load a KEY=VALUE file into dictionary."""
         config = {}
-        if os.path.exists(ENV_FILE):
-            with open(ENV_FILE, 'r') as f:
+        if os.path.exists(path):
+            with open(path, 'r') as f:
                 for line in f:
                     line = line.strip()
                     if line and not line.startswith('#') and '=' in line:
@@ -317,6 +460,7 @@ class ConfigManager:
         with open(ENV_FILE, 'w') as f:
             for key, value in config.items():
                 f.write(f"{key}={value}\n")
+        ConfigManager._env_cache['stamp'] = None
     
     @staticmethod
     def get_value(key):
@@ -428,41 +572,134 @@ class Spinner:
         pass
 
 
+class FileWatcher:
+    """Block until a file changes, using kernel notifications when available.
+    
+    Linux uses inotify, Windows uses directory change notifications. Other
+    platforms (or failures setting up the watch) fall back to a short sleep.
+    """
+    
+    IN_MODIFY = 0x00000002
+    IN_MOVE_SELF = 0x00000800
+    FILE_NOTIFY_CHANGE_SIZE = 0x00000008
+    FILE_NOTIFY_CHANGE_LAST_WRITE = 0x00000010
+    
+    def __init__(self, path):
+        self.path = path
+        self._fd = None      # inotify descriptor (Linux)
+        self._handle = None  # change notification handle (Windows)
+    
+    def __enter__(self):
+        try:
+            if IS_WINDOWS:
+                self._open_windows()
+            elif sys.platform.startswith('linux'):
+                self._open_inotify()
+        except (OSError, AttributeError):
+            self._fd = self._handle = None
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        if self._handle is not None:
+            ctypes.windll.kernel32.FindCloseChangeNotification(ctypes.c_void_p(self._handle))
+            self._handle = None
+    
+    def _open_inotify(self):
+        libc = ctypes.CDLL(None, use_errno=True)
+        fd = libc.inotify_init1(os.O_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(fd, os.fsencode(self.path), self.IN_MODIFY | self.IN_MOVE_SELF) < 0:
+            errno = ctypes.get_errno()
+            os.close(fd)
+            raise OSError(errno, "inotify_add_watch failed")
+        self._fd = fd
+    
+    def _open_windows(self):
+        kernel32 = ctypes.windll.kernel32
+        kernel32.FindFirstChangeNotificationW.restype = ctypes.c_void_p
+        handle = kernel32.FindFirstChangeNotificationW(
+            os.path.dirname(os.path.abspath(self.path)), False,
+            self.FILE_NOTIFY_CHANGE_SIZE | self.FILE_NOTIFY_CHANGE_LAST_WRITE
+        )
+        if handle is None or handle == ctypes.c_void_p(-1).value:
+            raise OSError("FindFirstChangeNotificationW failed")
+        self._handle = handle
+    
+    def wait(self):
+        """Return once the file has (probably) changed."""
+        if self._fd is not None:
+            select.select([self._fd], [], [])
+            os.read(self._fd, 4096)  # Drain queued events
+        elif self._handle is not None:
+            # Bounded wait keeps Ctrl+C responsive and covers lazily-flushed
+            # NTFS size updates on files held open by another process.
+            kernel32 = ctypes.windll.kernel32
+            kernel32.WaitForSingleObject(ctypes.c_void_p(self._handle), 1000)
+            kernel32.FindNextChangeNotification(ctypes.c_void_p(self._handle))
+        else:
+            time.sleep(0.1)
+
+
 # --- Setup Functions ---
 
-def setup_env_file():
-    """Interactive setup wizard for .env file."""
+def ask(message, default="", key=None, answers=None):
+    """Prompt for a setup value.
+    
+    In non-interactive mode (answers is a dict) the value is taken from
+    answers[key] instead, falling back to the default without prompting.
+    """
+    if answers is not None:
+        value = answers.get(key, default) if key else default
+        return str(value).strip()
+    return input(message).strip() or default
+
+
+def setup_env_file(answers=None, force=False):
+    """Interactive setup wizard for .env file.
+    
+    Pass an answers dict (e.g. loaded with --config-file) to run unattended.
+    An existing .env is only overwritten after confirmation, or with force
+    when unattended; its secrets are kept and the old file is backed up.
+    """
     env_sample = Path(ENV_SAMPLE)
     env_file = Path(ENV_FILE)
+    interactive = answers is None
 
     print_banner("PrecliniTrain Setup Wizard")
 
+    existing = {}
     if env_file.exists():
-        if not confirm_action(".env file already exists. Overwrite?", default=False):
-            Colors.info("Setup cancelled.")
+        if interactive:
+            if not confirm_action(".env file already exists. Overwrite?", default=False):
+                Colors.info("Setup cancelled.")
+                return
+        elif not force:
+            Colors.error(".env file already exists. Pass --force to overwrite it (secrets are kept).")
             return
+        existing = ConfigManager.load_env()
 
     if not env_sample.exists():
         Colors.error("env-sample file not found. Cannot proceed with setup.")
         return
 
-    # Copy env-sample to .env
-    shutil.copy(env_sample, env_file)
-    Colors.info("Created .env file from env-sample template.")
-
-    # Interactive configuration
-    config = ConfigManager.load_env()
+    # Start from the env-sample template; .env is only written (and backed up) at the end
+    config = ConfigManager.load_file(env_sample)
+    Colors.info("Using env-sample as the .env template.")
 
     print("\n--- Deployment Mode ---")
     print("1. Docker (Recommended for production)")
     print("2. Native (Direct deployment)")
-    deployment_choice = input("Choice [1]: ").strip() or "1"
-    deployment_mode = 'docker' if deployment_choice == '1' else 'native'
+    deployment_choice = ask("Choice [1]: ", "1", 'DEPLOYMENT_MODE', answers)
+    deployment_mode = 'native' if deployment_choice in ['2', 'native'] else 'docker'
     config['DEPLOYMENT_MODE'] = deployment_mode
 
     # Port configuration with availability checking
     print("\n--- Application Port ---")
-    app_port = input("Application Port [5001]: ").strip() or "5001"
+    app_port = ask("Application Port [5001]: ", "5001", 'APP_PORT', answers)
     
     Colors.info(f"Checking port {app_port} availability...")
     if not PortManager.check_port_available(app_port):
@@ -474,7 +711,7 @@ def setup_env_file():
             for i, port in enumerate(alternatives, 1):
                 print(f"  {i}. {port}")
             
-            choice = input(f"Choose an alternative (1-{len(alternatives)}) or press Enter to use {app_port} anyway: ").strip()
+            choice = ask(f"Choose an alternative (1-{len(alternatives)}) or press Enter to use {app_port} anyway: ", answers=answers)
             if choice.isdigit() and 1 <= int(choice) <= len(alternatives):
                 app_port = str(alternatives[int(choice) - 1])
                 Colors.success(f"Port changed to {app_port}")
@@ -484,37 +721,48 @@ def setup_env_file():
     config['APP_PORT'] = app_port
 
     # Security
+    # Draw all generated secrets from a single CSPRNG read and slice it up:
+    # SECRET_KEY, SERVICE_API_KEY, SSO_SECRET_KEY (64 hex chars each),
+    # admin password, DB password, DB root password (32 hex chars each).
     print("\n--- Security Configuration ---")
-    secret_key = secrets.token_hex(32)
-    config['SECRET_KEY'] = secret_key
-    Colors.success("Generated secure SECRET_KEY.")
+    # Secrets from an existing .env win: new ones would log users out and
+    # lock the app out of an already-initialised database volume.
+    entropy = secrets.token_hex(144)
+
+    def secret(key, generated):
+        return existing.get(key) or generated
+
+    config['SECRET_KEY'] = secret('SECRET_KEY', entropy[0:64])
+    Colors.success("Kept existing SECRET_KEY." if existing.get('SECRET_KEY') else "Generated secure SECRET_KEY.")
 
     # Admin credentials
     print("\n--- Admin User ---")
-    admin_email = input("Admin email [admin@example.com]: ").strip() or "admin@example.com"
-    admin_password = input("Admin password (leave empty to generate): ").strip()
-    if not admin_password:
-        admin_password = secrets.token_hex(16)
+    admin_email = ask("Admin email [admin@example.com]: ", "admin@example.com", 'ADMIN_EMAIL', answers)
+    admin_password = ask("Admin password (leave empty to generate): ", "", 'ADMIN_PASSWORD', answers)
+    if not admin_password and existing.get('ADMIN_PASSWORD'):
+        admin_password = existing['ADMIN_PASSWORD']
+        Colors.info("Kept existing admin password.")
+    elif not admin_password:
+        admin_password = entropy[192:224]
         Colors.warning(f"Generated admin password: {admin_password}")
     
     config['ADMIN_EMAIL'] = admin_email
     config['ADMIN_PASSWORD'] = admin_password
 
     # Service API Keys
-    service_api_key = secrets.token_hex(32)
-    config['SERVICE_API_KEY'] = service_api_key
-    Colors.success("Generated SERVICE_API_KEY for inter-app communication.")
+    config['SERVICE_API_KEY'] = secret('SERVICE_API_KEY', entropy[64:128])
+    Colors.success("SERVICE_API_KEY set for inter-app communication.")
 
-    sso_secret_key = secrets.token_hex(32)
-    config['SSO_SECRET_KEY'] = sso_secret_key
-    Colors.success("Generated SSO_SECRET_KEY for seamless login.")
+    config['SSO_SECRET_KEY'] = secret('SSO_SECRET_KEY', entropy[128:192])
+    Colors.success("SSO_SECRET_KEY set for seamless login.")
 
     # Database configuration
     print("\n--- Database Configuration ---")
     if deployment_mode == 'docker':
         print("1. Docker Container (MariaDB)")
         print("2. External Database")
-        db_choice = input("Choice [1]: ").strip() or "1"
+        external = not interactive and answers.get('DB_HOST', 'db') != 'db'
+        db_choice = ask("Choice [1]: ", "2" if external else "1", answers=answers)
         
         if db_choice == '1':
             # Docker internal database
@@ -523,32 +771,33 @@ def setup_env_file():
             config['DB_PORT'] = '3306'
             config['DB_NAME'] = 'preclinitrain'
             config['DB_USER'] = 'appuser'
-            config['DB_PASSWORD'] = secrets.token_hex(16)
-            config['DB_ROOT_PASSWORD'] = secrets.token_hex(16)
+            config['DB_PASSWORD'] = secret('DB_PASSWORD', entropy[224:256])
+            config['DB_ROOT_PASSWORD'] = secret('DB_ROOT_PASSWORD', entropy[256:288])
             Colors.success("Configured internal MariaDB container")
         else:
-            setup_external_database(config)
+            setup_external_database(config, answers)
     else:
         print("1. SQLite (Simplest)")
         print("2. External MySQL/MariaDB")
-        db_choice = input("Choice [1]: ").strip() or "1"
+        external = not interactive and answers.get('DB_TYPE', 'sqlite') in ['mysql', 'mariadb']
+        db_choice = ask("Choice [1]: ", "2" if external else "1", answers=answers)
         
         if db_choice == '1':
             config['DB_TYPE'] = 'sqlite'
             Colors.success("Configured SQLite database")
         else:
-            setup_external_database(config)
+            setup_external_database(config, answers)
 
     # Email configuration
     print("\n--- Email Configuration (Optional) ---")
     print("Used for password resets and system notifications.")
-    configure_email = input("Configure SMTP settings now? (y/N): ").strip().lower()
+    configure_email = ask("Configure SMTP settings now? (y/N): ", "y" if not interactive and answers.get('MAIL_SERVER') else "n", answers=answers).lower()
     if configure_email == 'y':
-        mail_server = input("Mail server [smtp.gmail.com]: ").strip() or "smtp.gmail.com"
-        mail_port = input("Mail port [587]: ").strip() or "587"
-        mail_use_tls = input("Use TLS? (True/False) [True]: ").strip() or "True"
-        mail_username = input("Mail username: ").strip()
-        mail_password = input("Mail password: ").strip()
+        mail_server = ask("Mail server [smtp.gmail.com]: ", "smtp.gmail.com", 'MAIL_SERVER', answers)
+        mail_port = ask("Mail port [587]: ", "587", 'MAIL_PORT', answers)
+        mail_use_tls = ask("Use TLS? (True/False) [True]: ", "True", 'MAIL_USE_TLS', answers)
+        mail_username = ask("Mail username: ", "", 'MAIL_USERNAME', answers)
+        mail_password = ask("Mail password: ", "", 'MAIL_PASSWORD', answers)
 
         config['MAIL_SERVER'] = mail_server
         config['MAIL_PORT'] = mail_port
@@ -562,10 +811,11 @@ def setup_env_file():
 
     # Precliniverse Integration
     print("\n--- Precliniverse Integration ---")
-    if input("Configure Precliniverse integration? (y/N): ").lower() == 'y':
+    configure_pc = ask("Configure Precliniverse integration? (y/N): ", "y" if not interactive and answers.get('PC_API_KEY') else "n", answers=answers)
+    if configure_pc.lower() == 'y':
         default_pc_url = "http://precliniverse:8000" if deployment_mode == 'docker' else "http://localhost:8000"
-        config['PC_API_URL'] = input(f"Precliniverse API URL [{default_pc_url}]: ").strip() or default_pc_url
-        config['PC_API_KEY'] = input("Precliniverse SERVICE_API_KEY (from Precliniverse .env): ").strip()
+        config['PC_API_URL'] = ask(f"Precliniverse API URL [{default_pc_url}]: ", default_pc_url, 'PC_API_URL', answers)
+        config['PC_API_KEY'] = ask("Precliniverse SERVICE_API_KEY (from Precliniverse .env): ", "", 'PC_API_KEY', answers)
         if not config['PC_API_KEY']:
             Colors.warning("No key provided. You can set it later with: python manage.py set-config PC_API_KEY <key>")
         else:
@@ -575,8 +825,8 @@ def setup_env_file():
         config['PC_ENABLED'] = 'False'
         Colors.info("Precliniverse integration disabled. Can be enabled later.")
 
-    # Save configuration
-    ConfigManager.save_env(config, backup=False)
+    # Save configuration, backing up any .env being replaced
+    ConfigManager.save_env(config, backup=True)
     
     # Show important information
     print("\n" + "="*60)
@@ -603,14 +853,15 @@ def setup_env_file():
     Colors.info("  2. Access application at http://localhost:" + app_port)
 
 
-def setup_external_database(config):
+def setup_external_database(config, answers=None):
     """Setup external database configuration with connection testing."""
+    interactive = answers is None
     config['DB_TYPE'] = 'mysql'
-    db_host = input("Database host [localhost]: ").strip() or "localhost"
-    db_port = input("Database port [3306]: ").strip() or "3306"
-    db_name = input("Database name [preclinitrain]: ").strip() or "preclinitrain"
-    db_user = input("Database user: ").strip()
-    db_password = input("Database password: ").strip()
+    db_host = ask("Database host [localhost]: ", "localhost", 'DB_HOST', answers)
+    db_port = ask("Database port [3306]: ", "3306", 'DB_PORT', answers)
+    db_name = ask("Database name [preclinitrain]: ", "preclinitrain", 'DB_NAME', answers)
+    db_user = ask("Database user: ", "", 'DB_USER', answers)
+    db_password = ask("Database password: ", "", 'DB_PASSWORD', answers)
     
     config['DB_HOST'] = db_host
     config['DB_PORT'] = db_port
@@ -620,18 +871,18 @@ def setup_external_database(config):
     
     # For Docker, also ask for root password
     if config.get('DEPLOYMENT_MODE') == 'docker':
-        db_root_password = input("Database root password (for Docker container): ").strip()
+        db_root_password = ask("Database root password (for Docker container): ", "", 'DB_ROOT_PASSWORD', answers)
         if db_root_password:
             config['DB_ROOT_PASSWORD'] = db_root_password
     
     # Test connection
-    if confirm_action("Test database connection now?", default=True):
+    if not interactive or confirm_action("Test database connection now?", default=True):
         Colors.info("Testing database connection...")
         success, msg = DatabaseManager.test_connection(config)
         if success:
             Colors.success(msg)
             # Offer to create database
-            if confirm_action("Create database if it doesn't exist?", default=True):
+            if not interactive or confirm_action("Create database if it doesn't exist?", default=True):
                 success_create, msg_create = DatabaseManager.create_database_if_not_exists(config)
                 if success_create:
                     Colors.success(msg_create)
@@ -639,7 +890,7 @@ def setup_external_database(config):
                     Colors.warning(msg_create)
         else:
             Colors.error(f"Connection failed: {msg}")
-            if not confirm_action("Continue anyway?", default=False):
+            if interactive and not confirm_action("Continue anyway?", default=False):
                 Colors.warning("Returning to database configuration...")
                 setup_external_database(config)
                 return
@@ -657,12 +908,12 @@ def deploy():
     mode = config.get('DEPLOYMENT_MODE', 'docker')
     
     if mode == 'docker':
-        deploy_docker()
+        deploy_docker(config)
     else:
-        deploy_native()
+        deploy_native(config)
 
 
-def deploy_docker():
+def deploy_docker(config=None):
     """Deploy using Docker Compose."""
     if not check_docker():
         return
@@ -682,17 +933,25 @@ def deploy_docker():
     run_command("docker compose build")
     run_command("docker compose up -d")
     
-    # Wait for services to be ready
-    time.sleep(3)
+    if config is None:
+        config = ConfigManager.load_env()
+    port = config.get('APP_PORT', '5001')
     
-    Colors.success("Deployment complete!")
+    # Wait for the app port to start accepting connections
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if not PortManager.check_port_available(port):
+            break
+        time.sleep(0.1)
+    else:
+        Colors.warning(f"Services did not open port {port} within 30s. Check: docker compose logs")
+        return
     
-    config = ConfigManager.load_env()
-    port = config.get('APP_PORT', '5001')
+    Colors.success("Deployment complete!")
     Colors.info(f"Application should be available at http://localhost:{port}")
 
 
-def deploy_native():
+def deploy_native(config=None):
     """Deploy in native mode."""
     Colors.header("Native Deployment")
     
@@ -759,33 +1018,37 @@ def deploy_native():
     Colors.info("To start the application:")
     Colors.info("  python manage.py start")
     Colors.info("Or manually with gunicorn:")
-    config = ConfigManager.load_env()
+    if config is None:
+        config = ConfigManager.load_env()
     port = config.get('APP_PORT', '5001')
     Colors.info(f"  {python_exec} -m gunicorn -w 4 -b 0.0.0.0:{port} 'app:create_app()'")
 
 
 # --- Service Management ---
 
-def start():
+def start(config=None):
     """Start the application."""
-    config = ConfigManager.load_env()
+    get_app_status.cache_clear()
+    if config is None:
+        config = ConfigManager.load_env()
     mode = config.get('DEPLOYMENT_MODE', 'docker')
     
     if mode == 'docker':
         if not check_docker():
             return
         Colors.info("Starting services...")
-        run_command("docker compose up -d")
+        run_command(["docker", "compose", "up", "-d"], shell=False)
         Colors.success("Services started")
     else:
-        start_native()
+        start_native(config)
 
 
-def start_native():
+def start_native(config=None):
     """Start application in native mode using gunicorn."""
     Colors.header("Starting Native Application")
     
-    config = ConfigManager.load_env()
+    if config is None:
+        config = ConfigManager.load_env()
     port = config.get('APP_PORT', '5001')
     
     # Check for venv
@@ -799,12 +1062,10 @@ def start_native():
     pid_file = os.path.join("logs", "gunicorn.pid")
     if os.path.exists(pid_file):
         try:
-            with open(pid_file, 'r') as f:
-                pid = int(f.read().strip())
+            pid = _read_pidfile(pid_file)
             # Check if process is running
             if IS_WINDOWS:
-                result = subprocess.run(['tasklist', '/FI', f'PID eq {pid}', '/NH'], capture_output=True, text=True)
-                if str(pid) in result.stdout:
+                if _win_pid_alive(pid):
                     Colors.warning(f"Application already running (PID: {pid})")
                     return
             else:
@@ -860,92 +1121,349 @@ def start_native():
         log_file = os.path.join("logs", "gunicorn.log")
         error_log = os.path.join("logs", "gunicorn_error.log")
         
-        cmd = f'"{python_exec}" -m gunicorn -w 4 -b 0.0.0.0:{port} --pid "{pid_file}" --access-logfile "{log_file}" --error-logfile "{error_log}" --daemon "app:create_app()"'
-        run_command(cmd, check=False)
+        cmd = [
+            python_exec, "-m", "gunicorn", "-w", "4", "-b", f"0.0.0.0:{port}",
+            "--pid", pid_file, "--access-logfile", log_file, "--error-logfile", error_log,
+            "app:create_app()"
+        ]
         
-        time.sleep(2)
+        if not PortManager.check_port_available(port):
+            # Otherwise the readiness probe below would see the other listener
+            Colors.error(f"Port {port} is already in use.")
+            return
         
-        if os.path.exists(pid_file):
-            with open(pid_file, 'r') as f:
-                pid = f.read().strip()
-            Colors.success(f"Application started (PID: {pid})")
+        try:
+            # Own session instead of --daemon: we keep the master PID and can watch it
+            with open(log_file, "a") as log, open(error_log, "a") as err:
+                process = subprocess.Popen(
+                    cmd,
+                    stdin=subprocess.DEVNULL,
+                    stdout=log,
+                    stderr=err,
+                    start_new_session=True
+                )
+        except OSError as e:
+            Colors.error(f"Failed to start: {e}")
+            return
+        
+        # gunicorn retries a busy bind for several seconds before giving up,
+        # so only report success once the port actually accepts connections
+        if _wait_port_listening(port, process) and process.poll() is None:
+            Colors.success(f"Application started (PID: {process.pid})")
             Colors.info(f"URL: http://localhost:{port}")
             logs_native()
+        elif process.poll() is None:
+            Colors.warning(f"Gunicorn is running (PID: {process.pid}) but port {port} is not listening yet.")
+            Colors.info(f"Error log: {error_log}")
         else:
             Colors.error("Failed to start. Check logs for details.")
             Colors.info(f"Error log: {error_log}")
 
 
-def stop():
+def stop(config=None):
     """Stop the application."""
-    config = ConfigManager.load_env()
+    get_app_status.cache_clear()
+    if config is None:
+        config = ConfigManager.load_env()
     mode = config.get('DEPLOYMENT_MODE', 'docker')
     
     if mode == 'docker':
         if not check_docker():
             return
         Colors.info("Stopping services...")
-        run_command("docker compose stop")
+        run_command(["docker", "compose", "stop"], shell=False)
         Colors.success("Services stopped")
     else:
-        stop_native()
+        stop_native(config)
+
+
+def _open_pidfd(pid):
+    """Open a pidfd for pid, or return None where unsupported (non-Linux, kernel < 5.3)."""
+    if not hasattr(os, 'pidfd_open'):
+        return None
+    try:
+        return os.pidfd_open(pid)
+    except ProcessLookupError:
+        raise
+    except OSError:
+        return None
+
+
+def _wait_pid_exit(pid, timeout, pidfd=None):
+    """Wait up to timeout seconds for pid to exit. Returns True if it exited."""
+    if pidfd is not None:
+        # The pidfd becomes readable as soon as the process terminates
+        poller = select.poll()
+        poller.register(pidfd, select.POLLIN)
+        return bool(poller.poll(timeout * 1000))
+    
+    if hasattr(select, 'kqueue'):
+        # macOS/BSD: wait for NOTE_EXIT on the process
+        try:
+            kq = select.kqueue()
+            try:
+                event = select.kevent(pid, filter=select.KQ_FILTER_PROC,
+                                      flags=select.KQ_EV_ADD | select.KQ_EV_ONESHOT,
+                                      fflags=select.KQ_NOTE_EXIT)
+                return bool(kq.control([event], 1, timeout))
+            finally:
+                kq.close()
+        except ProcessLookupError:
+            return True
+        except OSError:
+            pass
+    
+    # Fallback: probe liveness until the deadline
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return True
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.05)
+
+
+def _win_terminate_all(pids, timeout_ms=2000):
+    """Terminate Windows processes and wait for all of them to exit.
+    
+    Returns True if at least one process was terminated and all of them exited in time.
+    """
+    PROCESS_TERMINATE = 0x0001
+    SYNCHRONIZE = 0x00100000
+    WAIT_FAILED = 0xFFFFFFFF
+    WAIT_TIMEOUT = 0x102
+    MAXIMUM_WAIT_OBJECTS = 64
+    
+    kernel32 = ctypes.windll.kernel32
+    kernel32.OpenProcess.restype = ctypes.c_void_p
+    handles = []
+    try:
+        for pid in pids:
+            handle = kernel32.OpenProcess(SYNCHRONIZE | PROCESS_TERMINATE, False, int(pid))
+            if not handle:
+                continue
+            handle = ctypes.c_void_p(handle)
+            if kernel32.TerminateProcess(handle, 1):
+                handles.append(handle)
+            else:
+                kernel32.CloseHandle(handle)
+        if not handles:
+            return False
+        
+        # One wait for every handle (in batches of the API limit)
+        deadline = time.monotonic() + timeout_ms / 1000
+        for i in range(0, len(handles), MAXIMUM_WAIT_OBJECTS):
+            batch = handles[i:i + MAXIMUM_WAIT_OBJECTS]
+            array = (ctypes.c_void_p * len(batch))(*(h.value for h in batch))
+            remaining = max(0, int((deadline - time.monotonic()) * 1000))
+            result = kernel32.WaitForMultipleObjects(len(batch), array, True, remaining)
+            if result in (WAIT_TIMEOUT, WAIT_FAILED):
+                return False
+        return True
+    finally:
+        for handle in handles:
+            kernel32.CloseHandle(handle)
+
+
+def _win_terminate_and_wait(pid, timeout_ms=2000):
+    """Terminate a Windows process and wait for it to exit. Returns True if it exited."""
+    return _win_terminate_all([pid], timeout_ms)
+
+
+def _win_listening_pids(port):
+    """Return PIDs owning a TCP listener on port, straight from the IP Helper API."""
+    import socket
+    AF_INET = 2
+    AF_INET6 = 23
+    TCP_TABLE_OWNER_PID_LISTENER = 3
+    NO_ERROR = 0
+    ERROR_INSUFFICIENT_BUFFER = 122
+    DWORD = ctypes.c_ulong
+    
+    class MIB_TCPROW_OWNER_PID(ctypes.Structure):
+        _fields_ = [("dwState", DWORD), ("dwLocalAddr", DWORD), ("dwLocalPort", DWORD),
+                    ("dwRemoteAddr", DWORD), ("dwRemotePort", DWORD), ("dwOwningPid", DWORD)]
+    
+    class MIB_TCP6ROW_OWNER_PID(ctypes.Structure):
+        _fields_ = [("ucLocalAddr", ctypes.c_ubyte * 16), ("dwLocalScopeId", DWORD), ("dwLocalPort", DWORD),
+                    ("ucRemoteAddr", ctypes.c_ubyte * 16), ("dwRemoteScopeId", DWORD), ("dwRemotePort", DWORD),
+                    ("dwState", DWORD), ("dwOwningPid", DWORD)]
+    
+    iphlpapi = ctypes.windll.iphlpapi
+    pids = set()
+    for family, row_type in ((AF_INET, MIB_TCPROW_OWNER_PID), (AF_INET6, MIB_TCP6ROW_OWNER_PID)):
+        # First call sizes the buffer; retry if the table grows in between
+        size = DWORD(0)
+        buf = None
+        while True:
+            ret = iphlpapi.GetExtendedTcpTable(buf, ctypes.byref(size), False, family,
+                                               TCP_TABLE_OWNER_PID_LISTENER, 0)
+            if ret == ERROR_INSUFFICIENT_BUFFER:
+                buf = ctypes.create_string_buffer(size.value)
+                continue
+            if ret != NO_ERROR:
+                raise OSError(ret, "GetExtendedTcpTable failed")
+            break
+        if buf is None:
+            continue
+        # Layout: DWORD dwNumEntries followed by the rows
+        count = DWORD.from_buffer(buf).value
+        rows = (row_type * count).from_buffer(buf, ctypes.sizeof(DWORD))
+        for row in rows:
+            # dwLocalPort holds the port in network byte order in its low 16 bits
+            if socket.ntohs(row.dwLocalPort & 0xFFFF) == int(port) and row.dwOwningPid > 0:
+                pids.add(row.dwOwningPid)
+    return pids
+
+
+def _win_pid_alive(pid):
+    """Check whether a Windows PID belongs to a running process (no tasklist spawn)."""
+    PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+    STILL_ACTIVE = 259
+    ERROR_ACCESS_DENIED = 5
+    
+    kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+    kernel32.OpenProcess.restype = ctypes.c_void_p
+    handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, int(pid))
+    if not handle:
+        # Access denied: the process exists but belongs to another user.
+        # Anything else (ERROR_INVALID_PARAMETER) means no such process.
+        return ctypes.get_last_error() == ERROR_ACCESS_DENIED
+    handle = ctypes.c_void_p(handle)
+    try:
+        code = ctypes.c_ulong()
+        if not kernel32.GetExitCodeProcess(handle, ctypes.byref(code)):
+            return True
+        return code.value == STILL_ACTIVE
+    finally:
+        kernel32.CloseHandle(handle)
+
+
+def _ensure_fd_capacity(count):
+    """Raise the soft RLIMIT_NOFILE if count extra descriptors might not fit."""
+    try:
+        import resource
+    except ImportError:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    needed = count + 64  # Headroom for stdio, sockets and log files
+    if soft != resource.RLIM_INFINITY and soft < needed:
+        new_soft = needed if hard == resource.RLIM_INFINITY else min(needed, hard)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (new_soft, hard))
 
 
-def stop_native():
+def _terminate_all(pids, timeout=2):
+    """SIGTERM every pid, wait for all of them at once, then SIGKILL stragglers.
+    
+    Returns True if at least one process was signalled.
+    """
+    _ensure_fd_capacity(len(pids))
+    pidfds = {}
+    try:
+        for pid in pids:
+            try:
+                # Open before signalling so a recycled PID can't fool the wait
+                pidfd = _open_pidfd(pid)
+            except ProcessLookupError:
+                continue
+            try:
+                os.kill(pid, 15)  # SIGTERM
+            except ProcessLookupError:
+                if pidfd is not None:
+                    os.close(pidfd)
+                continue
+            pidfds[pid] = pidfd
+        
+        alive = set(pidfds)
+        deadline = time.monotonic() + timeout
+        if alive and None not in pidfds.values():
+            # Single poll() over every pidfd
+            poller = select.poll()
+            fd_to_pid = {}
+            for pid, pidfd in pidfds.items():
+                poller.register(pidfd, select.POLLIN)
+                fd_to_pid[pidfd] = pid
+            while alive:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                for fd, _ in poller.poll(remaining * 1000):
+                    alive.discard(fd_to_pid[fd])
+                    poller.unregister(fd)
+        else:
+            for pid in list(alive):
+                if _wait_pid_exit(pid, max(0, deadline - time.monotonic())):
+                    alive.discard(pid)
+        
+        for pid in alive:
+            try:
+                os.kill(pid, 9)  # SIGKILL
+            except ProcessLookupError:
+                pass
+        return bool(pidfds)
+    finally:
+        for pidfd in pidfds.values():
+            if pidfd is not None:
+                os.close(pidfd)
+
+
+def stop_native(config=None):
     """Stop native application."""
     Colors.info("Stopping application...")
     
-    # Check both standard locations
-    pid_files = [
-        os.path.join("logs", "app.pid"),      # Windows/Waitress
-        os.path.join("logs", "gunicorn.pid")  # Linux/Gunicorn
-    ]
+    # Check both standard locations: app.pid (Windows/Waitress), gunicorn.pid (Linux/Gunicorn)
+    entries = _logs_dir_snapshot()
+    pid_files = [entries[name].path for name in ("app.pid", "gunicorn.pid") if name in entries]
     
     stopped = False
     
     for pid_file in pid_files:
-        if os.path.exists(pid_file):
-            try:
-                with open(pid_file, 'r') as f:
-                    pid = int(f.read().strip())
-                
-                Colors.info(f"Stopping PID {pid} from {os.path.basename(pid_file)}...")
-                
-                if IS_WINDOWS:
-                    subprocess.run(f'taskkill /PID {pid} /F', shell=True, capture_output=True)
-                else:
+        try:
+            pid = _read_pidfile(pid_file)
+            
+            Colors.info(f"Stopping PID {pid} from {os.path.basename(pid_file)}...")
+            
+            if IS_WINDOWS:
+                _win_terminate_and_wait(pid)
+            else:
+                # Open the pidfd before signalling so a recycled PID can't fool the wait
+                pidfd = _open_pidfd(pid)
+                try:
                     os.kill(pid, 15)  # SIGTERM
-                    time.sleep(2)
-                    try:
-                        os.kill(pid, 0)  # Check if still running
-                        os.kill(pid, 9)  # Force kill with SIGKILL
-                    except ProcessLookupError:
-                        pass  # Already dead
-                
+                    if not _wait_pid_exit(pid, 2, pidfd):
+                        try:
+                            os.kill(pid, 9)  # Force kill with SIGKILL
+                        except ProcessLookupError:
+                            pass  # Exited in the meantime
+                finally:
+                    if pidfd is not None:
+                        os.close(pidfd)
+            
+            os.remove(pid_file)
+            Colors.success(f"Application stopped (PID: {pid})")
+            stopped = True
+        except (ValueError, ProcessLookupError, OSError) as e:
+            Colors.warning(f"Could not stop process from {pid_file}: {e}")
+            if os.path.exists(pid_file):
                 os.remove(pid_file)
-                Colors.success(f"Application stopped (PID: {pid})")
-                stopped = True
-            except (ValueError, ProcessLookupError, OSError) as e:
-                Colors.warning(f"Could not stop process from {pid_file}: {e}")
-                if os.path.exists(pid_file):
-                    os.remove(pid_file)
 
     if not stopped:
         # Fallback: Check if port is still in use and kill that process (Zombie cleanup)
-        config = ConfigManager.load_env()
+        if config is None:
+            config = ConfigManager.load_env()
         port = config.get('APP_PORT', '5001')
         
         killed_orphans = kill_process_by_port(port)
         
         if killed_orphans:
             Colors.success(f"Force killed orphaned process(es) on port {port}")
-            # Give OS a moment to release file handles
-            time.sleep(1)
         else:
             if not IS_WINDOWS:
                 # Fallback for Linux gunicorn
                 Colors.info("Looking for gunicorn processes...")
-                result = subprocess.run("pgrep -f 'gunicorn.*app:create_app'", shell=True, capture_output=True, text=True)
+                result = subprocess.run(['pgrep', '-f', 'gunicorn.*app:create_app'], capture_output=True, text=True)
                 if result.stdout.strip():
                     pids = result.stdout.strip().split('\n')
                     for pid in pids:
@@ -966,59 +1484,108 @@ def kill_process_by_port(port):
     """Kill process listening on a specific port."""
     if IS_WINDOWS:
         try:
-            # Find PID using netstat
-            cmd = f'netstat -ano | findstr :{port}'
-            result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-            if not result.stdout:
+            pids = _win_listening_pids(port)
+            if not pids:
                 return False
             
-            lines = result.stdout.strip().split('\n')
-            killed = False
-            for line in lines:
-                # Expected format: TCP    0.0.0.0:5001    0.0.0.0:0    LISTENING    1234
-                # Note: findstr might match partial ports, so verify alignment if possible, 
-                # but simplistic approach usually works for dev envs.
-                parts = line.split()
-                if len(parts) >= 5:
-                    pid = parts[-1]
-                    state = parts[3] 
-                    if pid.isdigit() and int(pid) > 0:
-                        # Only kill if it looks like a listener process or we are desperate
-                        try:
-                            subprocess.run(f'taskkill /PID {pid} /F', shell=True, capture_output=True)
-                            killed = True
-                        except:
-                            pass
-            return killed
+            # Terminate them all, then wait once until every handle is released
+            return _win_terminate_all(pids)
         except:
             return False
     else:
         # Linux
         try:
-             # Try fuser
-             cmd = f"fuser -k {port}/tcp"
-             res = subprocess.run(cmd, shell=True, capture_output=True)
-             if res.returncode == 0:
-                 return True
-             
-             # Try lsof
-             cmd = f"lsof -t -i:{port} | xargs -r kill"
-             subprocess.run(cmd, shell=True)
-             return True
+            try:
+                result = subprocess.run(['lsof', '-t', f'-iTCP:{port}', '-sTCP:LISTEN'],
+                                        capture_output=True, text=True)
+            except FileNotFoundError:
+                # No lsof: fuser prints the PIDs on stdout
+                result = subprocess.run(['fuser', f'{port}/tcp'], capture_output=True, text=True)
+            pids = {int(pid) for pid in PID_RE.findall(result.stdout)}
+            if not pids:
+                return False
+            return _terminate_all(pids)
         except:
-             return False
+            return False
+
+
+def _wait_port_free(port, timeout=5):
+    """Wait until port can be bound again, backing off 1/5/20/80 ms between tries."""
+    import socket
+    delays = [0.001, 0.005, 0.02, 0.08]
+    deadline = time.monotonic() + timeout
+    attempt = 0
+    while True:
+        try:
+            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+                if IS_WINDOWS:
+                    # Windows' SO_REUSEADDR would bind over a live listener; ask for exclusive use
+                    s.setsockopt(socket.SOL_SOCKET, socket.SO_EXCLUSIVEADDRUSE, 1)
+                else:
+                    # Same option the server sets, so TIME_WAIT leftovers don't count as busy
+                    s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+                s.bind(('0.0.0.0', int(port)))
+            return True
+        except OSError:
+            pass
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(delays[min(attempt, len(delays) - 1)], remaining))
+        attempt += 1
+
+
+def _wait_port_listening(port, process, timeout=30):
+    """Wait until port accepts connections, giving up early if process exits.
+    
+    The reverse of _wait_port_free. Returns True once the port is listening.
+    """
+    delays = [0.05, 0.1, 0.2, 0.5]
+    deadline = time.monotonic() + timeout
+    attempt = 0
+    try:
+        pidfd = _open_pidfd(process.pid)
+    except ProcessLookupError:
+        return False
+    try:
+        while True:
+            if not PortManager.check_port_available(port):
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            delay = min(delays[min(attempt, len(delays) - 1)], remaining)
+            # Sleep on the process itself so a failed start is noticed immediately
+            if pidfd is not None:
+                if _wait_pid_exit(process.pid, delay, pidfd):
+                    return False
+            else:
+                try:
+                    process.wait(timeout=delay)
+                    return False
+                except subprocess.TimeoutExpired:
+                    pass
+            attempt += 1
+    finally:
+        if pidfd is not None:
+            os.close(pidfd)
 
 
-def restart():
+def restart(config=None):
     """Restart the application."""
-    stop()
-    time.sleep(2)
-    start()
+    if config is None:
+        config = ConfigManager.load_env()
+    stop(config)
+    port = config.get('APP_PORT', '5001')
+    if not _wait_port_free(port):
+        Colors.warning(f"Port {port} still busy after stop; starting anyway")
+    start(config)
 
 
-def logs():
+def logs(config=None):
     """Show application logs."""
-    config = ConfigManager.load_env()
+    if config is None:
+        config = ConfigManager.load_env()
     mode = config.get('DEPLOYMENT_MODE', 'docker')
     
     if mode == 'docker':
@@ -1030,15 +1597,63 @@ def logs():
         logs_native()
 
 
+def _tail_offset(fd, lines=10):
+    """Offset at which the last `lines` lines of the open file start."""
+    end = os.lseek(fd, 0, os.SEEK_END)
+    pos = end
+    seen = 0
+    while pos > 0:
+        size = min(8192, pos)
+        pos -= size
+        os.lseek(fd, pos, os.SEEK_SET)
+        chunk = os.read(fd, size)
+        if pos + size == end and chunk.endswith(b'\n'):
+            # The file's final newline ends the last line rather than starting one
+            chunk = chunk[:-1]
+        i = len(chunk)
+        while True:
+            i = chunk.rfind(b'\n', 0, i)
+            if i < 0:
+                break
+            seen += 1
+            if seen == lines:
+                return pos + i + 1
+    return 0
+
+
+def _tail_follow(path, lines=10):
+    """Python implementation of tail -f that sleeps until the file changes.
+    
+    Like tail, it starts with the last `lines` lines. New data is copied as
+    raw bytes in 64 KiB reads with one flush per notification, rather than
+    decoding and printing line by line.
+    """
+    out = sys.stdout.buffer
+    fd = os.open(path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+    try:
+        with FileWatcher(path) as watcher:
+            os.lseek(fd, _tail_offset(fd, lines), os.SEEK_SET)
+            while True:
+                wrote = False
+                while True:
+                    chunk = os.read(fd, 65536)
+                    if not chunk:
+                        break
+                    out.write(chunk)
+                    wrote = True
+                if wrote:
+                    out.flush()
+                watcher.wait()
+    finally:
+        os.close(fd)
+
+
 def logs_native():
     """Show native application logs."""
-    log_files = [
-        os.path.join("logs", "gunicorn.log"),
-        os.path.join("logs", "app.log")
-    ]
+    entries = _logs_dir_snapshot()
     
     # Sort files by modification time, newest last, but prefer app.log or gunicorn.log over others
-    existing_logs = [f for f in log_files if os.path.exists(f)]
+    existing_logs = [entries[name].path for name in ("gunicorn.log", "app.log") if name in entries]
     
     if not existing_logs:
         Colors.warning("No log files found in logs/")
@@ -1048,28 +1663,20 @@ def logs_native():
     Colors.info(f"Tailing {target_log} (Ctrl+C to exit logs)...")
     
     try:
-        if IS_WINDOWS:
-            # Python implementation of tail -f
-            with open(target_log, 'r') as f:
-                # Seek to end
-                f.seek(0, 2)
-                while True:
-                    line = f.readline()
-                    if not line:
-                        time.sleep(0.1)
-                        continue
-                    print(line, end='')
+        if IS_WINDOWS or sys.platform.startswith('linux'):
+            _tail_follow(target_log)
         else:
-            # Linux: Use tail command
+            # Other Unix: Use tail command
             subprocess.run(['tail', '-f', target_log])
     except KeyboardInterrupt:
         print() # Newline
         Colors.info("Stopped watching logs. Application is still running.")
 
 
-def create_admin():
+def create_admin(config=None):
     """Create admin user."""
-    config = ConfigManager.load_env()
+    if config is None:
+        config = ConfigManager.load_env()
     mode = config.get('DEPLOYMENT_MODE', 'docker')
     
     if mode == 'docker':
@@ -1134,13 +1741,15 @@ def bump(part='patch'):
     """Bump the version number."""
     version_file = "VERSION"
     if not os.path.exists(version_file):
-        with open(version_file, "w") as f:
-            f.write("1.0.0")
+        _write_small_file(version_file, "1.0.0")
         Colors.success("Created VERSION file with 1.0.0")
         return
 
-    with open(version_file, "r") as f:
-        current_version = f.read().strip()
+    fd = os.open(version_file, os.O_RDONLY)
+    try:
+        current_version = os.read(fd, 256).decode().strip()
+    finally:
+        os.close(fd)
 
     try:
         # Handle versions like 1.0.0-rc2
@@ -1171,50 +1780,41 @@ def bump(part='patch'):
         # Suffixes are usually lost on bump unless we decide otherwise
         # For this simple implementation, we'll clear the suffix on bump
         
-        with open(version_file, "w") as f:
-            f.write(new_version)
+        _write_small_file(version_file, new_version)
         
         Colors.success(f"Version bumped: {current_version} -> {new_version}")
     except Exception as e:
         Colors.error(f"Failed to bump version: {e}")
 
 
-def get_app_status():
-    """Get formatted application status."""
-    config = ConfigManager.load_env()
+@ttl_cache(2)
+def get_app_status(config=None):
+    """Get formatted application status (cached for 2s; cleared by start/stop)."""
+    if config is None:
+        config = ConfigManager.load_env()
     mode = config.get('DEPLOYMENT_MODE', 'docker')
 
     if mode == 'docker':
         # Check docker status
-        try:
-             subprocess.run("docker info", shell=True, capture_output=True, check=True)
-             pass
-        except:
+        if not docker_daemon_running():
              return f"{Colors.FAIL}Docker Error{Colors.ENDC}"
 
         # Check if containers are running
         res = run_command("docker compose ps --services --filter status=running", capture_output=True, check=False)
-        if res.stdout.strip():
+        if res:
             return f"{Colors.OKGREEN}Running (Docker){Colors.ENDC}"
         return f"{Colors.WARNING}Stopped (Docker){Colors.ENDC}"
     else:
         # Native status
-        pid_files = [
-            os.path.join("logs", "app.pid"),
-            os.path.join("logs", "gunicorn.pid")
-        ]
-        for pf in pid_files:
-            if os.path.exists(pf):
+        entries = _logs_dir_snapshot()
+        for name in ("app.pid", "gunicorn.pid"):
+            if name in entries:
                 try:
-                    with open(pf, 'r') as f:
-                        pid = int(f.read().strip())
+                    pid = _read_pidfile(entries[name].path)
                     
                     is_running = False
                     if IS_WINDOWS:
-                        # Check tasklist
-                        res = subprocess.run(['tasklist', '/FI', f'PID eq {pid}', '/NH'], capture_output=True, text=True)
-                        if str(pid) in res.stdout:
-                            is_running = True
+                        is_running = _win_pid_alive(pid)
                     else:
                         try:
                             os.kill(pid, 0)
@@ -1231,10 +1831,156 @@ def get_app_status():
         return f"{Colors.WARNING}Stopped{Colors.ENDC}"
 
 
+# --- Health & Diagnostics ---
+
+def check_ports(config=None):
+    """Verify the application port is free and suggest alternatives."""
+    print_banner("Port Availability Check")
+
+    if config is None:
+        config = ConfigManager.load_env()
+    app_port = config.get('APP_PORT', '5001')
+
+    table = StatusTable()
+
+    if PortManager.check_port_available(app_port):
+        table.add_row(f"Application Port ({app_port})", "Available", "Ready to use")
+    else:
+        info = PortManager.get_port_info(app_port)
+        table.add_row(f"Application Port ({app_port})", "Unavailable", info[:47])
+
+        alternatives = PortManager.suggest_alternative_ports(app_port)
+        if alternatives:
+            Colors.warning(f"Port {app_port} is in use. Suggested alternatives:")
+            for alt in alternatives:
+                Colors.info(f"  - {alt}")
+
+    table.render()
+
+
+def check_db(config=None):
+    """Test database connectivity (exits non-zero on failure)."""
+    print_banner("Database Connectivity Check")
+
+    if config is None:
+        config = ConfigManager.load_env()
+
+    with Spinner("Testing database connection"):
+        success, message = DatabaseManager.test_connection(config)
+
+    if success:
+        Colors.success(f"Database: {message}")
+
+        if config.get('DB_TYPE') in ['mysql', 'mariadb']:
+            success_create, msg_create = DatabaseManager.create_database_if_not_exists(config)
+            if success_create:
+                Colors.success(msg_create)
+            else:
+                Colors.warning(msg_create)
+    else:
+        Colors.error(f"Database connection failed: {message}")
+
+        if config.get('DB_TYPE') in ['mysql', 'mariadb']:
+            Colors.info("Troubleshooting tips:")
+            Colors.info("  1. Verify database server is running")
+            Colors.info("  2. Check DB_HOST, DB_PORT, DB_USER, DB_PASSWORD in .env")
+            Colors.info("  3. Ensure user has access to the database")
+            Colors.info("  4. For Docker: check container is running")
+        sys.exit(1)
+
+
+def health(config=None):
+    """Run comprehensive health checks and print diagnostics."""
+    print_banner("System Health Check")
+
+    table = StatusTable()
+    if config is None:
+        config = ConfigManager.load_env()
+
+    issues_found = []
+    fixes_suggested = []
+
+    # 1. Check Configuration
+    if os.path.exists(ENV_FILE):
+         table.add_row("Configuration", "OK", f"{len(config)} parameters loaded")
+    else:
+         table.add_row("Configuration", "Missing", "Run 'setup' to create")
+         issues_found.append("No .env configuration file")
+         fixes_suggested.append("Run: python manage.py setup")
+
+    # 2. Check Ports
+    app_port = config.get('APP_PORT', '5001')
+    if PortManager.check_port_available(app_port):
+        table.add_row(f"Port {app_port}", "Available", "")
+    else:
+        if PortManager.is_app_using_port(app_port, config):
+            table.add_row(f"Port {app_port}", "Active", "Used by this application")
+        else:
+            table.add_row(f"Port {app_port}", "In Use", "Conflict with other process")
+            issues_found.append(f"Port {app_port} is already in use by another process")
+            alternatives = PortManager.suggest_alternative_ports(app_port, 2)
+            if alternatives:
+                fixes_suggested.append(f"Use alternative port: python manage.py set-config APP_PORT {alternatives[0]}")
+
+    # 3. Check Database
+    db_success, db_msg = DatabaseManager.test_connection(config)
+    if db_success:
+        table.add_row("Database", "Connected", db_msg)
+    else:
+        table.add_row("Database", "Failed", db_msg[:47])
+        issues_found.append(f"Database not accessible: {db_msg}")
+        if config.get('DB_TYPE') in ['mysql', 'mariadb']:
+            fixes_suggested.append("1. Start database: docker-compose up -d db (if using Docker)")
+            fixes_suggested.append("2. Verify credentials in .env file")
+            fixes_suggested.append("3. Run: python manage.py check-db")
+
+    # 4. Check Directories
+    missing_dirs = _missing_dirs()
+    if missing_dirs:
+        table.add_row("Directories", "Warning", f"Missing: {', '.join(missing_dirs)}")
+        issues_found.append(f"Missing directories: {', '.join(missing_dirs)}")
+        fixes_suggested.append("Directories will be created automatically on deploy")
+    else:
+        table.add_row("Directories", "OK", "All present")
+
+    # 5. Check Docker (if in docker mode)
+    if config.get('DEPLOYMENT_MODE') == 'docker':
+        if docker_daemon_running():
+            table.add_row("Docker", "Running", "")
+        elif shutil.which("docker"):
+            table.add_row("Docker", "Error", "Not accessible")
+            issues_found.append("Docker is not running or not accessible")
+            fixes_suggested.append("Start Docker Desktop or Docker daemon")
+        else:
+            table.add_row("Docker", "Error", "Not found or not running")
+            issues_found.append("Docker not found")
+            fixes_suggested.append("Install Docker: https://docker.com/get-started")
+
+    # Render Table
+    table.render()
+
+    # Render Diagnostics if issues found
+    if issues_found:
+        print("\n" + "="*60)
+        Colors.header(f"Diagnostics: Found {len(issues_found)} issue(s)")
+        print("="*60)
+        for i, issue in enumerate(issues_found, 1):
+            Colors.error(f"  {i}. {issue}")
+
+        print()
+        Colors.info("Suggested fixes:")
+        for fix in fixes_suggested:
+            Colors.info(f"  • {fix}")
+    else:
+        Colors.success("All systems operational. No issues detected.")
+
+
 def interactive_menu():
     """Show interactive menu."""
     while True:
-        status = get_app_status()
+        # One .env load per menu iteration, shared by every action below
+        config = ConfigManager.load_env()
+        status = get_app_status(config)
         print_banner(f"PrecliniTrain Manager\n   Status: {status}")
         
         print("1. Start/Restart Application")
@@ -1253,20 +1999,20 @@ def interactive_menu():
         try:
             if choice == '1': 
                 if "Running" in status:
-                    restart()
+                    restart(config)
                 else:
-                    start()
-            elif choice == '2': stop()
-            elif choice == '3': logs()
+                    start(config)
+            elif choice == '2': stop(config)
+            elif choice == '3': logs(config)
             elif choice == '4': deploy()
             elif choice == '5': setup_env_file()
-            elif choice == '6': create_admin()
+            elif choice == '6': create_admin(config)
             elif choice == '7': 
                 if platform.system().lower() == 'windows':
                     os.system('cls')
                 else:
                     os.system('clear')
-                subprocess.run([sys.executable, "manage.py", "health"])
+                health(config)
                 input("\nPress Enter to continue...")
                 
             elif choice == '8':
@@ -1297,12 +2043,34 @@ def interactive_menu():
 
 
 # --- Main ---
+# Argument-free commands dispatched without building the argparse tree
+FAST_PATHS = {
+    'start': start,
+    'stop': stop,
+    'restart': restart,
+    'logs': logs,
+    'health': health,
+    'check-ports': check_ports,
+    'check-db': check_db,
+}
+
+
 def main():
+    if len(sys.argv) == 2 and sys.argv[1] in FAST_PATHS:
+        FAST_PATHS[sys.argv[1]]()
+        return
+    
     parser = argparse.ArgumentParser(description="PrecliniTrain CLI")
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
 
     # Setup command
-    subparsers.add_parser('setup', help='Initial setup wizard')
+    setup_parser = subparsers.add_parser('setup', help='Initial setup wizard')
+    setup_parser.add_argument('--non-interactive', action='store_true',
+                              help='Do not prompt; use defaults and --config-file answers')
+    setup_parser.add_argument('--config-file',
+                              help='KEY=VALUE answers file for unattended setup (implies --non-interactive)')
+    setup_parser.add_argument('--force', action='store_true',
+                              help='Unattended only: overwrite an existing .env (secrets are kept, the old file is backed up)')
 
     # Deployment commands
     subparsers.add_parser('deploy', help='Deploy application')
@@ -1347,7 +2115,15 @@ def main():
 
     # Execute command
     if args.command == 'setup':
-        setup_env_file()
+        answers = None
+        if args.config_file:
+            if not os.path.exists(args.config_file):
+                Colors.error(f"Config file not found: {args.config_file}")
+                sys.exit(1)
+            answers = ConfigManager.load_file(args.config_file)
+        elif args.non_interactive:
+            answers = {}
+        setup_env_file(answers, force=args.force)
     elif args.command == 'deploy':
         deploy()
     elif args.command == 'start':
@@ -1403,139 +2179,13 @@ def main():
     
     # Health checks
     elif args.command == "check-ports":
-        print_banner("Port Availability Check")
-        
-        config = ConfigManager.load_env()
-        app_port = config.get('APP_PORT', '5001')
-        
-        table = StatusTable()
-        
-        if PortManager.check_port_available(app_port):
-            table.add_row(f"Application Port ({app_port})", "Available", "Ready to use")
-        else:
-            info = PortManager.get_port_info(app_port)
-            table.add_row(f"Application Port ({app_port})", "Unavailable", info[:47])
-            
-            alternatives = PortManager.suggest_alternative_ports(app_port)
-            if alternatives:
-                Colors.warning(f"Port {app_port} is in use. Suggested alternatives:")
-                for alt in alternatives:
-                    Colors.info(f"  - {alt}")
-        
-        table.render()
+        check_ports()
     
     elif args.command == "check-db":
-        print_banner("Database Connectivity Check")
-        
-        config = ConfigManager.load_env()
-        
-        with Spinner("Testing database connection"):
-            success, message = DatabaseManager.test_connection(config)
-        
-        if success:
-            Colors.success(f"Database: {message}")
-            
-            if config.get('DB_TYPE') in ['mysql', 'mariadb']:
-                success_create, msg_create = DatabaseManager.create_database_if_not_exists(config)
-                if success_create:
-                    Colors.success(msg_create)
-                else:
-                    Colors.warning(msg_create)
-        else:
-            Colors.error(f"Database connection failed: {message}")
-            
-            if config.get('DB_TYPE') in ['mysql', 'mariadb']:
-                Colors.info("Troubleshooting tips:")
-                Colors.info("  1. Verify database server is running")
-                Colors.info("  2. Check DB_HOST, DB_PORT, DB_USER, DB_PASSWORD in .env")
-                Colors.info("  3. Ensure user has access to the database")
-                Colors.info("  4. For Docker: check container is running")
-            sys.exit(1)
+        check_db()
     
     elif args.command == "health":
-        print_banner("System Health Check")
-        
-        table = StatusTable()
-        config = ConfigManager.load_env()
-        
-        issues_found = []
-        fixes_suggested = []
-        
-        # 1. Check Configuration
-        if os.path.exists(ENV_FILE):
-             table.add_row("Configuration", "OK", f"{len(config)} parameters loaded")
-        else:
-             table.add_row("Configuration", "Missing", "Run 'setup' to create")
-             issues_found.append("No .env configuration file")
-             fixes_suggested.append("Run: python manage.py setup")
-
-        # 2. Check Ports
-        app_port = config.get('APP_PORT', '5001')
-        if PortManager.check_port_available(app_port):
-            table.add_row(f"Port {app_port}", "Available", "")
-        else:
-            if PortManager.is_app_using_port(app_port, config):
-                table.add_row(f"Port {app_port}", "Active", "Used by this application")
-            else:
-                table.add_row(f"Port {app_port}", "In Use", "Conflict with other process")
-                issues_found.append(f"Port {app_port} is already in use by another process")
-                alternatives = PortManager.suggest_alternative_ports(app_port, 2)
-                if alternatives:
-                    fixes_suggested.append(f"Use alternative port: python manage.py set-config APP_PORT {alternatives[0]}")
-        
-        # 3. Check Database
-        db_success, db_msg = DatabaseManager.test_connection(config)
-        if db_success:
-            table.add_row("Database", "Connected", db_msg)
-        else:
-            table.add_row("Database", "Failed", db_msg[:47])
-            issues_found.append(f"Database not accessible: {db_msg}")
-            if config.get('DB_TYPE') in ['mysql', 'mariadb']:
-                fixes_suggested.append("1. Start database: docker-compose up -d db (if using Docker)")
-                fixes_suggested.append("2. Verify credentials in .env file")
-                fixes_suggested.append("3. Run: python manage.py check-db")
-
-        # 4. Check Directories
-        missing_dirs = [d for d in REQUIRED_DIRS if not os.path.exists(d)]
-        if missing_dirs:
-            table.add_row("Directories", "Warning", f"Missing: {', '.join(missing_dirs)}")
-            issues_found.append(f"Missing directories: {', '.join(missing_dirs)}")
-            fixes_suggested.append("Directories will be created automatically on deploy")
-        else:
-            table.add_row("Directories", "OK", "All present")
-        
-        # 5. Check Docker (if in docker mode)
-        if config.get('DEPLOYMENT_MODE') == 'docker':
-            try:
-                result = subprocess.run("docker info", shell=True, capture_output=True, timeout=3)
-                if result.returncode == 0:
-                    table.add_row("Docker", "Running", "")
-                else:
-                    table.add_row("Docker", "Error", "Not accessible")
-                    issues_found.append("Docker is not running or not accessible")
-                    fixes_suggested.append("Start Docker Desktop or Docker daemon")
-            except:
-                table.add_row("Docker", "Error", "Not found or not running")
-                issues_found.append("Docker not found")
-                fixes_suggested.append("Install Docker: https://docker.com/get-started")
-        
-        # Render Table
-        table.render()
-        
-        # Render Diagnostics if issues found
-        if issues_found:
-            print("\n" + "="*60)
-            Colors.header(f"Diagnostics: Found {len(issues_found)} issue(s)")
-            print("="*60)
-            for i, issue in enumerate(issues_found, 1):
-                Colors.error(f"  {i}. {issue}")
-            
-            print()
-            Colors.info("Suggested fixes:")
-            for fix in fixes_suggested:
-                Colors.info(f"  • {fix}")
-        else:
-            Colors.success("All systems operational. No issues detected.")
+        health()
     
     elif args.command == "doctor":
         print_banner("System Diagnostics")
@@ -1572,19 +2222,19 @@ def main():
                 fixes_suggested.append("3. Run: python manage.py check-db")
         
         # Check directories
-        missing_dirs = [d for d in REQUIRED_DIRS if not os.path.exists(d)]
+        missing_dirs = _missing_dirs()
         if missing_dirs:
             issues_found.append(f"Missing directories: {', '.join(missing_dirs)}")
             fixes_suggested.append("Directories will be created automatically on deploy")
         
         # Check Docker (if docker mode)
         if config.get('DEPLOYMENT_MODE') == 'docker':
-            try:
-                result = subprocess.run("docker info", shell=True, capture_output=True, timeout=3)
-                if result.returncode != 0:
-                    issues_found.append("Docker is not running or not accessible")
-                    fixes_suggested.append("Start Docker Desktop or Docker daemon")
-            except:
+            if docker_daemon_running():
+                pass
+            elif shutil.which("docker"):
+                issues_found.append("Docker is not running or not accessible")
+                fixes_suggested.append("Start Docker Desktop or Docker daemon")
+            else:
                 issues_found.append("Docker not found")
                 fixes_suggested.append("Install Docker: https://docker.com/get-started")
         
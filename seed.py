@@ -6,11 +6,16 @@ from app.models import (
     TrainingRequest, ExternalTraining, Role, Permission, InitialRegulatoryTrainingLevel,
     InitialRegulatoryTraining, ContinuousTrainingType, ContinuousTrainingEvent,
     ContinuousTrainingEventStatus, UserContinuousTrainingStatus, UserContinuousTraining,
-    Complexity, TrainingRequestStatus, ExternalTrainingStatus, init_roles_and_permissions
+    Complexity, TrainingRequestStatus, ExternalTrainingStatus, ExternalTrainingSkillClaim,
+    init_roles_and_permissions, tutor_skill_association, user_team_membership, user_team_leadership, skill_species_association,
+    training_session_tutors, training_session_skills_covered, skill_practice_event_skills,
+    training_request_skills_requested, external_training_skill_claim_species_association
 )
 from werkzeug.security import generate_password_hash
 from faker import Faker
+from sqlalchemy.orm import selectinload
 import random
+import secrets
 from datetime import datetime, timedelta
 
 load_dotenv()
@@ -18,6 +23,38 @@ fake = Faker()
 
 app = create_app()
 
+def _bulk_chunked(model, rows, size=1000, return_defaults=False):
+    """Bulk insert rows in fixed-size chunks, flushing after each one."""
+    for i in range(0, len(rows), size):
+        db.session.bulk_insert_mappings(model, rows[i:i + size], return_defaults=return_defaults)
+        db.session.flush()
+
+def _chance(p):
+    """Return True with probability p percent (cheap stand-in for fake.boolean)."""
+    return random.random() * 100 < p
+
+def _random_datetimes(count, days_back, days_ahead=0):
+    """Draw count naive datetimes between days_back ago and days_ahead from now in one pass.
+
+    Same range semantics as fake.date_time_between('-Nd', '+Md'), without Faker's
+    per-call date string parsing.
+    """
+    start = datetime.now() - timedelta(days=days_back)
+    span = (days_back + days_ahead) * 86400
+    return [start + timedelta(seconds=random.randrange(span)) for _ in range(count)]
+
+def _unique_pool(generate, count):
+    """Draw count distinct values from a Faker provider up front, bypassing the fake.unique proxy."""
+    pool = set()
+    while len(pool) < count:
+        pool.add(generate())
+    return list(pool)
+
+def _insert_links(table, rows, size=1000):
+    """Insert association-table rows with one executemany per chunk."""
+    for i in range(0, len(rows), size):
+        db.session.execute(table.insert(), rows[i:i + size])
+
 def create_admin_user():
     admin_email = os.environ.get('ADMIN_EMAIL')
     admin_password = os.environ.get('ADMIN_PASSWORD')
@@ -36,91 +73,94 @@ def create_admin_user():
             return admin_user
 
 def create_teams(count=5):
+    existing_names = {name for (name,) in db.session.query(Team.name)}
     teams = []
-    for _ in range(count):
-        team_name = fake.unique.company() + " Team"
-        team = Team.query.filter_by(name=team_name).first()
-        if team is None:
-            team = Team(name=team_name)
-            db.session.add(team)
-            teams.append(team)
-    db.session.commit()
+    for company in _unique_pool(fake.company, count):
+        team_name = company + " Team"
+        if team_name not in existing_names:
+            teams.append({'name': team_name})
+    _bulk_chunked(Team, teams)
     print(f"Created {len(teams)} teams.")
     return Team.query.all()
 
 def create_users(teams, count=20):
     users = []
     study_levels = ['pre-BAC'] + [str(i) for i in range(9)] + ['8+']
-    for _ in range(count):
-        full_name = fake.name()
-        email = fake.unique.email()
-        password = "password" # Default password for generated users
-        is_admin = fake.boolean(chance_of_getting_true=10) # 10% chance of being admin
-        study_level = random.choice(study_levels)
-
-        user = User(full_name=full_name, email=email, is_admin=is_admin, study_level=study_level)
-        user.set_password(password)
-        db.session.add(user)
-        users.append(user)
-    db.session.commit()
-
-    # Assign users to teams and potentially as team leads after they are committed
+    password_hash = generate_password_hash("password") # Default password for generated users
+    for email in _unique_pool(fake.email, count):
+        users.append({
+            'full_name': fake.name(),
+            'email': email,
+            'password_hash': password_hash,
+            'is_admin': _chance(10), # 10% chance of being admin
+            'study_level': random.choice(study_levels),
+            'api_key': secrets.token_hex(32), # What User.__init__ would generate
+        })
+    _bulk_chunked(User, users, return_defaults=True)
+
+    # Assign users to teams and potentially as team leads once they have IDs
+    memberships = []
+    leaderships = []
     for user in users:
-        if teams and fake.boolean(chance_of_getting_true=70): # 70% chance to be in a team
+        if teams and _chance(70): # 70% chance to be in a team
             chosen_team = random.choice(teams)
-            user.teams.append(chosen_team)
-            if fake.boolean(chance_of_getting_true=20): # 20% chance of being team lead for that team
-                user.teams_as_lead.append(chosen_team)
-        db.session.add(user)
-    db.session.commit()
+            memberships.append({'user_id': user['id'], 'team_id': chosen_team.id})
+            if _chance(20): # 20% chance of being team lead for that team
+                leaderships.append({'user_id': user['id'], 'team_id': chosen_team.id})
+    _insert_links(user_team_membership, memberships)
+    _insert_links(user_team_leadership, leaderships)
     print(f"Created {len(users)} users and assigned them to teams.")
-    return User.query.all()
+    # The cross-linking steps read these relationships for every user; load them in one IN query each
+    return User.query.options(
+        selectinload(User.teams_as_lead),
+        selectinload(User.tutored_skills),
+        selectinload(User.assigned_training_paths)
+    ).all()
 
 def create_species(count=5):
+    existing_names = {name for (name,) in db.session.query(Species.name)}
     species_list = []
-    for _ in range(count):
-        species_name = fake.unique.word().capitalize() + " Species"
-        species = Species.query.filter_by(name=species_name).first()
-        if species is None:
-            species = Species(name=species_name)
-            db.session.add(species)
-            species_list.append(species)
-    db.session.commit()
+    for word in _unique_pool(fake.word, count):
+        species_name = word.capitalize() + " Species"
+        if species_name not in existing_names:
+            species_list.append({'name': species_name})
+    _bulk_chunked(Species, species_list)
     print(f"Created {len(species_list)} species.")
     return Species.query.all()
 
 def create_skills(species_list, count=30):
     skills = []
-    for _ in range(count):
-        skill_name = fake.unique.catch_phrase()
+    for skill_name in _unique_pool(fake.catch_phrase, count):
         description = fake.paragraph()
         validity_period_months = random.randint(6, 24)
         complexity = random.choice(list(Complexity))
         reference_urls_text = ", ".join([fake.url() for _ in range(random.randint(0, 2))])
         training_videos_urls_text = ", ".join([fake.url() for _ in range(random.randint(0, 2))])
-        potential_external_tutors_text = fake.name() if fake.boolean(chance_of_getting_true=30) else ""
-
-        skill = Skill(
-            name=skill_name,
-            description=description,
-            validity_period_months=validity_period_months,
-            complexity=complexity,
-            reference_urls_text=reference_urls_text,
-            training_videos_urls_text=training_videos_urls_text,
-            potential_external_tutors_text=potential_external_tutors_text
-        )
-        if species_list and fake.boolean(chance_of_getting_true=70):
-            skill.species.append(random.choice(species_list))
-        db.session.add(skill)
-        skills.append(skill)
-    db.session.commit()
+        potential_external_tutors_text = fake.name() if _chance(30) else ""
+
+        skills.append({
+            'name': skill_name,
+            'description': description,
+            'validity_period_months': validity_period_months,
+            'complexity': complexity,
+            'reference_urls_text': reference_urls_text,
+            'training_videos_urls_text': training_videos_urls_text,
+            'potential_external_tutors_text': potential_external_tutors_text
+        })
+    _bulk_chunked(Skill, skills, return_defaults=True)
+
+    skill_species = []
+    for skill in skills:
+        if species_list and _chance(70):
+            skill_species.append({'skill_id': skill['id'], 'species_id': random.choice(species_list).id})
+    _insert_links(skill_species_association, skill_species)
     print(f"Created {len(skills)} skills.")
-    return Skill.query.all()
+    return Skill.query.options(selectinload(Skill.species)).all()
 
 def create_training_paths(skills, species_list, count=10):
     training_paths = []
-    for _ in range(count):
-        path_name = fake.unique.bs() + " Training Path"
+    for bs in _unique_pool(fake.bs, count):
+        path_name = bs + " Training Path"
         description = fake.paragraph()
         
         if not species_list:
@@ -136,127 +176,155 @@ def create_training_paths(skills, species_list, count=10):
         
         db.session.add(training_path)
         training_paths.append(training_path)
-    db.session.commit()
+    db.session.flush()
     print(f"Created {len(training_paths)} training paths.")
     return TrainingPath.query.all()
 
 def create_training_sessions(users, skills, count=15):
     training_sessions = []
-    tutors = [u for u in users if u.tutored_skills] # Users who can tutor
+    # Users who can tutor: one DISTINCT query instead of a relationship check per user
+    tutor_ids = {uid for (uid,) in db.session.query(tutor_skill_association.c.user_id).distinct()}
+    tutors = [u for u in users if u.id in tutor_ids]
+    start_times = _random_datetimes(count, 365)
+    durations = random.choices(range(1, 5), k=count)
     
-    for _ in range(count):
+    for i in range(count):
         title = fake.sentence(nb_words=6)
         location = fake.address()
-        start_time = fake.date_time_between(start_date='-1y', end_date='now')
-        end_time = start_time + timedelta(hours=random.randint(1, 4))
-        animal_count = random.randint(1, 10) if fake.boolean(chance_of_getting_true=50) else None
-        ethical_authorization_id = fake.bothify(text='????-########') if fake.boolean(chance_of_getting_true=30) else None
-
-        tutor = random.choice(tutors) if tutors else None
-        
-        training_session = TrainingSession(
-            title=title,
-            location=location,
-            start_time=start_time,
-            end_time=end_time,
-            animal_count=animal_count,
-            ethical_authorization_id=ethical_authorization_id
-        )
-        
-        if tutor:
-            training_session.tutors.append(tutor)
-        
+        start_time = start_times[i]
+        end_time = start_time + timedelta(hours=durations[i])
+        animal_count = random.randint(1, 10) if _chance(50) else None
+        ethical_authorization_id = fake.bothify(text='????-########') if _chance(30) else None
+
+        training_sessions.append({
+            'title': title,
+            'location': location,
+            'start_time': start_time,
+            'end_time': end_time,
+            'animal_count': animal_count,
+            'ethical_authorization_id': ethical_authorization_id
+        })
+    _bulk_chunked(TrainingSession, training_sessions, return_defaults=True)
+
+    session_tutors = []
+    session_skills = []
+    for training_session in training_sessions:
+        if tutors:
+            session_tutors.append({'training_session_id': training_session['id'],
+                                   'user_id': random.choice(tutors).id})
         if skills:
             num_skills = random.randint(1, min(3, len(skills)))
-            training_session.skills_covered.extend(random.sample(skills, num_skills))
-            
-        db.session.add(training_session)
-        training_sessions.append(training_session)
-    db.session.commit()
+            session_skills.extend({'training_session_id': training_session['id'], 'skill_id': skill.id}
+                                  for skill in random.sample(skills, num_skills))
+    _insert_links(training_session_tutors, session_tutors)
+    _insert_links(training_session_skills_covered, session_skills)
     print(f"Created {len(training_sessions)} training sessions.")
-    return TrainingSession.query.all()
+    return TrainingSession.query.options(selectinload(TrainingSession.attendees)).all()
 
 def create_competencies(users, skills, training_sessions, count=50):
     competencies = []
-    for _ in range(count):
-        user = random.choice(users)
-        skill = random.choice(skills)
+    # One query for the pairs already stored, then pure set lookups
+    seen = {(user_id, skill_id) for user_id, skill_id in db.session.query(Competency.user_id, Competency.skill_id)}
+    # Draw every random pick for the loop in a few batched calls
+    user_pool = random.choices(users, k=count)
+    skill_pool = random.choices(skills, k=count)
+    level_pool = random.choices(['Novice', 'Intermediate', 'Expert'], k=count)
+    evaluator_pool = random.choices(users, k=count)
+    has_evaluator = [_chance(70) for _ in range(count)]
+    session_pool = random.choices(training_sessions, k=count) if training_sessions else [None] * count
+    has_session = [_chance(50) for _ in range(count)]
+    evaluation_dates = _random_datetimes(count, 2 * 365)
+    for i in range(count):
+        user = user_pool[i]
+        skill = skill_pool[i]
         
         # Ensure unique competency for user-skill pair
-        existing_competency = Competency.query.filter_by(user=user, skill=skill).first()
-        if existing_competency:
+        if (user.id, skill.id) in seen:
             continue
-
-        level = random.choice(['Novice', 'Intermediate', 'Expert'])
-        evaluation_date = fake.date_time_between(start_date='-2y', end_date='now')
-        evaluator = random.choice(users) if fake.boolean(chance_of_getting_true=70) else None
-        session = random.choice(training_sessions) if training_sessions and fake.boolean(chance_of_getting_true=50) else None
-
-        competency = Competency(
-            user=user,
-            skill=skill,
-            level=level,
-            evaluation_date=evaluation_date,
-            evaluator=evaluator,
-            training_session=session
-        )
-        db.session.add(competency)
-        competencies.append(competency)
-    db.session.commit()
+        seen.add((user.id, skill.id))
+
+        level = level_pool[i]
+        evaluation_date = evaluation_dates[i]
+        evaluator = evaluator_pool[i] if has_evaluator[i] else None
+        session = session_pool[i] if has_session[i] else None
+
+        competencies.append({
+            'user_id': user.id,
+            'skill_id': skill.id,
+            'level': level,
+            'evaluation_date': evaluation_date,
+            'evaluator_id': evaluator.id if evaluator else None,
+            'training_session_id': session.id if session else None
+        })
+    _bulk_chunked(Competency, competencies)
     print(f"Created {len(competencies)} competencies.")
     return Competency.query.all()
 
 def create_skill_practice_events(users, skills, count=40):
     practice_events = []
-    for _ in range(count):
-        user = random.choice(users)
-        skill = random.choice(skills)
-        practice_date = fake.date_time_between(start_date='-1y', end_date='now')
-        notes = fake.sentence() if fake.boolean(chance_of_getting_true=50) else None
-
-        event = SkillPracticeEvent(
-            user=user,
-            practice_date=practice_date,
-            notes=notes
-        )
-        event.skills.append(skill)
-        db.session.add(event)
-        practice_events.append(event)
-    db.session.commit()
+    user_pool = random.choices(users, k=count)
+    skill_pool = random.choices(skills, k=count)
+    practice_dates = _random_datetimes(count, 365)
+    for i in range(count):
+        user = user_pool[i]
+        skill = skill_pool[i]
+        practice_date = practice_dates[i]
+        notes = fake.sentence() if _chance(50) else None
+
+        practice_events.append({
+            'user_id': user.id,
+            'practice_date': practice_date,
+            'notes': notes,
+            '_skill_id': skill.id # Not a column; linked once the event has an ID
+        })
+    _bulk_chunked(SkillPracticeEvent, practice_events, return_defaults=True)
+    _insert_links(skill_practice_event_skills,
+                  [{'skill_practice_event_id': event['id'], 'skill_id': event['_skill_id']}
+                   for event in practice_events])
     print(f"Created {len(practice_events)} skill practice events.")
     return practice_events
 
 def create_training_requests(users, skills, count=20):
     training_requests = []
-    for _ in range(count):
-        requester = random.choice(users)
-        request_date = fake.date_time_between(start_date='-6m', end_date='now')
-        status = random.choice(list(TrainingRequestStatus))
-
-        request = TrainingRequest(
-            requester=requester,
-            request_date=request_date,
-            status=status
-        )
-        
+    requester_pool = random.choices(users, k=count)
+    status_pool = random.choices(list(TrainingRequestStatus), k=count)
+    request_dates = _random_datetimes(count, 182)
+    for i in range(count):
+        requester = requester_pool[i]
+        request_date = request_dates[i]
+        status = status_pool[i]
+
+        training_requests.append({
+            'requester_id': requester.id,
+            'request_date': request_date,
+            'status': status
+        })
+    _bulk_chunked(TrainingRequest, training_requests, return_defaults=True)
+
+    requested_skills = []
+    for request in training_requests:
         if skills:
             num_skills = random.randint(1, min(3, len(skills)))
-            request.skills_requested.extend(random.sample(skills, num_skills))
-            
-        db.session.add(request)
-        training_requests.append(request)
-    db.session.commit()
+            requested_skills.extend({'training_request_id': request['id'], 'skill_id': skill.id}
+                                    for skill in random.sample(skills, num_skills))
+    _insert_links(training_request_skills_requested, requested_skills)
     print(f"Created {len(training_requests)} training requests.")
     return training_requests
 
 def create_external_trainings(users, skills, count=10):
     external_trainings = []
-    for _ in range(count):
-        user = random.choice(users)
+    user_pool = random.choices(users, k=count)
+    status_pool = random.choices(list(ExternalTrainingStatus), k=count)
+    validator_pool = random.choices(users, k=count)
+    has_validator = [_chance(50) for _ in range(count)]
+    dates = _random_datetimes(count, 365)
+    claims = []
+    for i in range(count):
+        user = user_pool[i]
         external_trainer_name = fake.company()
-        date = fake.date_time_between(start_date='-1y', end_date='now')
-        status = random.choice(list(ExternalTrainingStatus))
-        validator = random.choice(users) if fake.boolean(chance_of_getting_true=50) else None
+        date = dates[i]
+        status = status_pool[i]
+        validator = validator_pool[i] if has_validator[i] else None
 
         external_training = ExternalTraining(
             user=user,
@@ -265,76 +333,80 @@ def create_external_trainings(users, skills, count=10):
             status=status,
             validator=validator
         )
-        db.session.add(external_training) # Add external_training to session immediately
-        db.session.flush() # Flush to assign an ID to external_training
+        db.session.add(external_training)
         
         if skills:
             num_skills = random.randint(1, min(3, len(skills)))
-            # For each skill, create an ExternalTrainingSkillClaim object
+            # Claim rows are inserted in bulk once the trainings have IDs
             for skill_obj in random.sample(skills, num_skills):
-                skill_claim = ExternalTrainingSkillClaim(
-                    level=random.choice(['Novice', 'Intermediate', 'Expert']),
-                    wants_to_be_tutor=fake.boolean(chance_of_getting_true=30),
-                    practice_date=fake.date_time_between(start_date=date, end_date='now') if fake.boolean(chance_of_getting_true=50) else None
-                )
-                skill_claim.skill = skill_obj # Assign skill object to the relationship
-                skill_claim.external_training = external_training # Explicitly link to parent external_training
-                db.session.add(skill_claim) # Add skill_claim to session
-                # Assign species associated with the skill to the skill claim
-                if skill_obj.species:
-                    skill_claim.species_claimed.extend(skill_obj.species)
-                # No need to append to external_training.skill_claims here, as it's handled by the relationship backref
+                claims.append((external_training, skill_obj, {
+                    'skill_id': skill_obj.id,
+                    'level': random.choice(['Novice', 'Intermediate', 'Expert']),
+                    'wants_to_be_tutor': _chance(30),
+                    'practice_date': fake.date_time_between(start_date=date, end_date='now') if _chance(50) else None
+                }))
             
         external_trainings.append(external_training)
-    db.session.commit()
+    db.session.flush() # One flush assigns every external training its ID
+
+    claim_rows = []
+    claim_species = []
+    for external_training, skill_obj, row in claims:
+        row['external_training_id'] = external_training.id
+        claim_rows.append(row)
+        # Assign species associated with the skill to the skill claim
+        claim_species.extend({
+            'external_training_skill_claim_external_training_id': external_training.id,
+            'external_training_skill_claim_skill_id': skill_obj.id,
+            'species_id': species.id
+        } for species in skill_obj.species)
+    _bulk_chunked(ExternalTrainingSkillClaim, claim_rows)
+    _insert_links(external_training_skill_claim_species_association, claim_species)
     print(f"Created {len(external_trainings)} external trainings.")
     return external_trainings
 
 def create_initial_regulatory_trainings(users):
     initial_trainings = []
     for user in users:
-        if fake.boolean(chance_of_getting_true=50): # 50% of users have initial training
+        if _chance(50): # 50% of users have initial training
             level = random.choice(list(InitialRegulatoryTrainingLevel))
             training_date = fake.date_time_between(start_date='-5y', end_date='-1y')
-            initial_training = InitialRegulatoryTraining(
-                user=user,
-                level=level,
-                training_date=training_date,
-                attachment_path=None # For simplicity, no attachments in seed
-            )
-            db.session.add(initial_training)
-            initial_trainings.append(initial_training)
-    db.session.commit()
+            initial_trainings.append({
+                'user_id': user.id,
+                'level': level,
+                'training_date': training_date,
+                'attachment_path': None # For simplicity, no attachments in seed
+            })
+    _bulk_chunked(InitialRegulatoryTraining, initial_trainings)
     print(f"Created {len(initial_trainings)} initial regulatory trainings.")
     return initial_trainings
 
 def create_continuous_training_events(users, count=20):
     events = []
-    for _ in range(count):
+    event_dates = _random_datetimes(count, 3 * 365, days_ahead=365)
+    for i in range(count):
         title = fake.sentence(nb_words=5)
         description = fake.paragraph()
         training_type = random.choice(list(ContinuousTrainingType))
         location = fake.city() if training_type == ContinuousTrainingType.PRESENTIAL else None
-        event_date = fake.date_time_between(start_date='-3y', end_date='+1y')
+        event_date = event_dates[i]
         duration_hours = random.randint(1, 8)
         creator = random.choice(users)
 
-        event = ContinuousTrainingEvent(
-            title=title,
-            description=description,
-            training_type=training_type,
-            location=location,
-            event_date=event_date,
-            duration_hours=duration_hours,
-            attachment_path=None, # For simplicity, no attachments in seed
-            creator=creator,
-            status=ContinuousTrainingEventStatus.APPROVED # Seeded events are approved by default
-        )
-        db.session.add(event)
-        events.append(event)
-    db.session.commit()
+        events.append({
+            'title': title,
+            'description': description,
+            'training_type': training_type,
+            'location': location,
+            'event_date': event_date,
+            'duration_hours': duration_hours,
+            'attachment_path': None, # For simplicity, no attachments in seed
+            'creator_id': creator.id,
+            'status': ContinuousTrainingEventStatus.APPROVED # Seeded events are approved by default
+        })
+    _bulk_chunked(ContinuousTrainingEvent, events)
     print(f"Created {len(events)} continuous training events.")
-    return events
+    return ContinuousTrainingEvent.query.all()
 
 def create_user_continuous_trainings(users, continuous_training_events, count_per_user=3):
     user_cts = []
@@ -348,25 +420,25 @@ def create_user_continuous_trainings(users, continuous_training_events, count_pe
                 validated_hours = event.duration_hours if status == UserContinuousTrainingStatus.APPROVED else None
                 validation_date = fake.date_time_between(start_date=event.event_date, end_date='now') if status == UserContinuousTrainingStatus.APPROVED else None
 
-                user_ct = UserContinuousTraining(
-                    user=user,
-                    event=event,
-                    attendance_attachment_path=None, # For simplicity, no attachments in seed
-                    status=status,
-                    validated_by=validated_by,
-                    validated_hours=validated_hours,
-                    validation_date=validation_date
-                )
-                db.session.add(user_ct)
-                user_cts.append(user_ct)
-    db.session.commit()
+                user_cts.append({
+                    'user_id': user.id,
+                    'event_id': event.id,
+                    'attendance_attachment_path': None, # For simplicity, no attachments in seed
+                    'status': status,
+                    'validated_by_id': validated_by.id if validated_by else None,
+                    'validated_hours': validated_hours,
+                    'validation_date': validation_date
+                })
+    _bulk_chunked(UserContinuousTraining, user_cts)
     print(f"Created {len(user_cts)} user continuous trainings.")
     return user_cts
 
 
 with app.app_context():
     db.create_all() # Ensure tables exist
-    init_roles_and_permissions()
+    # create_app() already initializes roles on a fresh database; only redo it if they are missing
+    if Role.query.first() is None:
+        init_roles_and_permissions()
 
     print("Seeding database...")
 
@@ -374,15 +446,12 @@ with app.app_context():
     
     teams = create_teams()
     users = create_users(teams)
-    
-    # Refresh objects from DB to ensure all relationships are correctly loaded after initial commit
-    teams = Team.query.all()
-    users = User.query.all()
 
     # Assign team leads by setting lead_id directly
+    lead_team_ids = {u.id: {t.id for t in u.teams_as_lead} for u in users}
     for team in teams:
         # Find users who are leads for this specific team
-        potential_leads = [u for u in users if team in u.teams_as_lead]
+        potential_leads = [u for u in users if team.id in lead_team_ids[u.id]]
         if potential_leads:
             # This part needs to be re-evaluated. The Team model does not have a lead_id attribute.
             # Team leads are associated via the many-to-many relationship team_leads.
@@ -396,42 +465,39 @@ with app.app_context():
 
     # Assign some skills to tutors
     for user in users:
-        if user.teams_as_lead and skills and fake.boolean(chance_of_getting_true=50):
+        if user.teams_as_lead and skills and _chance(50):
             # Get skills not already tutored by the user
-            available_skills = [skill for skill in skills if skill not in user.tutored_skills]
+            tutored_ids = {s.id for s in user.tutored_skills}
+            available_skills = [skill for skill in skills if skill.id not in tutored_ids]
             if available_skills:
                 num_tutored_skills = random.randint(1, min(3, len(available_skills)))
                 user.tutored_skills.extend(random.sample(available_skills, num_tutored_skills))
-                db.session.add(user)
-    db.session.commit()
     print("Assigned tutored skills to some team leads.")
 
     training_paths = create_training_paths(skills, species_list)
 
     # Assign some training paths to users
     for user in users:
-        if training_paths and fake.boolean(chance_of_getting_true=40):
+        if training_paths and _chance(40):
             # Get paths not already assigned to the user
-            available_paths = [path for path in training_paths if path not in user.assigned_training_paths]
+            assigned_ids = {p.id for p in user.assigned_training_paths}
+            available_paths = [path for path in training_paths if path.id not in assigned_ids]
             if available_paths:
                 num_assigned_paths = random.randint(1, min(2, len(available_paths)))
                 user.assigned_training_paths.extend(random.sample(available_paths, num_assigned_paths))
-                db.session.add(user)
-    db.session.commit()
     print("Assigned training paths to some users.")
 
     training_sessions = create_training_sessions(users, skills)
 
     # Assign attendees to training sessions
     for session in training_sessions:
-        if users and fake.boolean(chance_of_getting_true=70):
+        if users and _chance(70):
             # Get users not already assigned to the session
-            available_users = [user for user in users if user not in session.attendees]
+            attendee_ids = {u.id for u in session.attendees}
+            available_users = [user for user in users if user.id not in attendee_ids]
             if available_users:
                 num_attendees = random.randint(1, min(5, len(available_users)))
                 session.attendees.extend(random.sample(available_users, num_attendees))
-                db.session.add(session)
-    db.session.commit()
     print("Assigned attendees to training sessions.")
 
     competencies = create_competencies(users, skills, training_sessions)
@@ -443,4 +509,6 @@ with app.app_context():
     continuous_training_events = create_continuous_training_events(users)
     user_continuous_trainings = create_user_continuous_trainings(users, continuous_training_events)
 
+    # Everything above ran in a single transaction; commit it once
+    db.session.commit()
     print("Database seeding complete!")
@@ -1,16 +1,34 @@
 import subprocess
 import time
 import os
+import mmap
+import re
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
 
 FLASK_APP_DIR = "/home/petitdadm/preclinitrain"
 APP_OUT_PATH = os.path.join(FLASK_APP_DIR, "app.out")
 LOG_PATH = os.path.join(FLASK_APP_DIR, "logs", "preclinitrain.log")
 SERVER_URL = "http://localhost:5000"
+APP_OUT_PATTERN = re.compile(rb"Error|Traceback")
+LOG_PATTERN = re.compile(rb"ERROR|CRITICAL")
+MAX_WORKERS = 8
+STARTUP_TIMEOUT = 10
 
-def run_command(command, description):
+# One pooled session for every probe so connections are reused across URLs
+session = requests.Session()
+session.mount("http://", HTTPAdapter(pool_connections=MAX_WORKERS, pool_maxsize=MAX_WORKERS))
+session.mount("https://", HTTPAdapter(pool_connections=MAX_WORKERS, pool_maxsize=MAX_WORKERS))
+
+def run_command(command, description, timeout=30):
     print(f"[INFO] {description}")
-    process = subprocess.run(command, shell=True, capture_output=True, text=True)
+    # argv list, no intermediate shell; a hung script can't stall the check forever
+    try:
+        process = subprocess.run(command, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired as e:
+        print(f"[ERROR] Command timed out after {timeout}s: {command}")
+        return subprocess.CompletedProcess(command, -1, e.stdout, e.stderr)
     if process.returncode != 0:
         print(f"[ERROR] Command failed: {command}")
         print(f"Stdout: {process.stdout}")
@@ -26,39 +44,56 @@ def start_server():
         os.remove(LOG_PATH)
 
     # Start server
-    process = subprocess.Popen(f"{FLASK_APP_DIR}/run_server.sh", shell=True, cwd=FLASK_APP_DIR)
-    time.sleep(10) # Give server time to start
+    process = subprocess.Popen([f"{FLASK_APP_DIR}/run_server.sh"], cwd=FLASK_APP_DIR)
+    wait_for_server(process)
     return process
 
+def wait_for_server(process, timeout=STARTUP_TIMEOUT):
+    """Poll the server until it answers instead of sleeping for the full startup budget."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline and process.poll() is None:
+        try:
+            session.get(SERVER_URL, timeout=1)
+            return True
+        except requests.exceptions.RequestException:
+            time.sleep(0.2)
+    print(f"[ERROR] Server did not answer on {SERVER_URL} within {timeout}s")
+    return False
+
 def stop_server():
     print("[INFO] Stopping Flask server...")
-    run_command(f"{FLASK_APP_DIR}/stop_server.sh", "Stopping Flask server")
+    run_command([f"{FLASK_APP_DIR}/stop_server.sh"], "Stopping Flask server")
 
 def check_url(url):
     print(f"[INFO] Accessing URL: {url}")
     try:
-        response = requests.get(url, timeout=10)
+        response = session.get(url, timeout=10)
         print(f"[INFO] URL {url} returned status code: {response.status_code}")
         return response.status_code
     except requests.exceptions.RequestException as e:
         print(f"[ERROR] Failed to access URL {url}: {e}")
         return None
 
+def log_contains(path, pattern):
+    """Scan a log file for pattern through a read-only mmap (no full read into memory)."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return False
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return pattern.search(mapped) is not None
+
 def analyze_logs():
     errors_found = []
     print("[INFO] Analyzing server logs...")
 
-    if os.path.exists(APP_OUT_PATH):
+    # Only read the whole file when it actually has something to report
+    if os.path.exists(APP_OUT_PATH) and log_contains(APP_OUT_PATH, APP_OUT_PATTERN):
         with open(APP_OUT_PATH, "r") as f:
-            content = f.read()
-            if "Error" in content or "Traceback" in content:
-                errors_found.append(f"Errors/Tracebacks found in {APP_OUT_PATH}:\n{content}")
+            errors_found.append(f"Errors/Tracebacks found in {APP_OUT_PATH}:\n{f.read()}")
     
-    if os.path.exists(LOG_PATH):
+    if os.path.exists(LOG_PATH) and log_contains(LOG_PATH, LOG_PATTERN):
         with open(LOG_PATH, "r") as f:
-            content = f.read()
-            if "ERROR" in content or "CRITICAL" in content:
-                errors_found.append(f"Errors/Critical messages found in {LOG_PATH}:\n{content}")
+            errors_found.append(f"Errors/Critical messages found in {LOG_PATH}:\n{f.read()}")
     
     return errors_found
 
@@ -74,8 +109,9 @@ if __name__ == "__main__":
             f"{SERVER_URL}/auth/login"
         ]
 
-        for url in urls_to_check:
-            check_url(url)
+        # Probe concurrently so total time is the slowest URL, not the sum
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            list(executor.map(check_url, urls_to_check))
         
         errors = analyze_logs()
 
@@ -2,6 +2,11 @@ import sys
 import os
 import pytest
 from faker import Faker
+from flask import g
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event, select
+from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.pool import StaticPool
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
@@ -11,13 +16,46 @@ from config import Config
 
 import logging
 
+# One seeded Faker for the whole run: provider setup happens once and data is reproducible
+Faker.seed(0)
+fake = Faker()
+
 class TestConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    # One shared in-memory connection, so every session (and the app under test) sees the same schema
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'poolclass': StaticPool,
+        'connect_args': {'check_same_thread': False},
+    }
     WTF_CSRF_ENABLED = False # Disable CSRF for easier testing
+    SQLALCHEMY_ECHO = False
+    LOG_LEVEL = 'ERROR'
+    # A single PBKDF2 iteration: password checks stay real without the KDF cost
+    PASSWORD_HASH_METHOD = 'pbkdf2:sha256:1'
+
+class ConnectionBoundSession(Session):
+    """Session that always uses its bound connection.
+
+    Flask-SQLAlchemy's get_bind picks the engine from the model's metadata,
+    which would open a fresh connection outside the test transaction.
+    """
+    def get_bind(self, *args, **kwargs):
+        return self.bind
+
+def _configure_sqlite(dbapi_connection):
+    # pysqlite defers BEGIN on its own, which breaks SAVEPOINTs; let SQLAlchemy emit it
+    dbapi_connection.isolation_level = None
+    # Throwaway database: skip fsync and keep the journal and temp tables in RAM
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA synchronous=OFF")
+    cursor.execute("PRAGMA journal_mode=MEMORY")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
 
 @pytest.fixture(scope='session')
 def app():
+    # Session-scoped: the app is built once per run, so there is no second caller to memoise for
     app = create_app(TestConfig)
     with app.app_context():
         # Configure logging for tests
@@ -26,25 +64,59 @@ def app():
         app.logger.addHandler(logging.StreamHandler(sys.stderr))
         app.logger.setLevel(logging.ERROR)
 
+        # create_app has already opened the engine's only (StaticPool) connection,
+        # so a "connect" listener would never fire; configure that connection directly
+        raw_connection = db.engine.raw_connection()
+        try:
+            _configure_sqlite(raw_connection.dbapi_connection)
+        finally:
+            raw_connection.close()
+
+        @event.listens_for(db.engine, "begin")
+        def _emit_begin(conn):
+            conn.exec_driver_sql("BEGIN")
+
         db.create_all()
         init_roles_and_permissions()
         yield app
         db.session.remove()
         db.drop_all()
 
+@pytest.fixture(scope='session')
+def connection(app):
+    connection = db.engine.connect()
+    yield connection
+    connection.close()
+
+@pytest.fixture(scope='function')
+def db_session(app, connection):
+    # Run the test inside an outer transaction that is rolled back afterwards;
+    # commits made by the test or the app only release SAVEPOINTs inside it.
+    transaction = connection.begin()
+    app_session = db.session
+    # Scoped per app context like Flask-SQLAlchemy's own session, so a request
+    # gets its own session on the same connection
+    db.session = scoped_session(
+        sessionmaker(class_=ConnectionBoundSession, db=db, query_cls=db.Query, bind=connection,
+                     join_transaction_mode='create_savepoint'),
+        scopefunc=lambda: id(g._get_current_object()))
+    try:
+        yield db.session
+    finally:
+        db.session.remove()
+        db.session = app_session
+        transaction.rollback()
+
 @pytest.fixture(scope='function')
-def client(app):
+def client(app, db_session):
     with app.test_client() as client:
         with app.app_context():
             yield client
-            db.session.remove()
-            db.drop_all()
-            db.create_all()
 
 @pytest.fixture(scope='function')
-def admin_user(app):
+def admin_user(app, db_session):
     with app.app_context():
-        admin = User.query.filter_by(email='admin@example.com').first()
+        admin = db.session.execute(select(User).where(User.email == 'admin@example.com')).scalar_one_or_none()
         if not admin:
             admin = User(full_name='Admin User', email='admin@example.com', is_admin=True, is_approved=True)
             admin.set_password('admin_password')
@@ -52,11 +124,14 @@ def admin_user(app):
             db.session.commit()
         return admin
 
+@pytest.fixture(scope='function', name='db')
+def db_fixture(app):
+    return db
+
 @pytest.fixture(scope='function')
-def user_factory(app, db):
+def user_factory(app, db_session):
     def _user_factory(**kwargs):
         with app.app_context():
-            fake = Faker()
             user = User(
                 full_name=kwargs.get('full_name', fake.name()),
                 email=kwargs.get('email', fake.email()),
@@ -1,6 +1,6 @@
 import pytest
 from flask import url_for
-from app.models import User, ContinuousTrainingEvent, UserContinuousTraining, ContinuousTrainingType, UserContinuousTrainingStatus
+from app.models import User, ContinuousTrainingEvent, UserContinuousTraining, ContinuousTrainingType, UserContinuousTrainingStatus, ContinuousTrainingEventStatus
 from datetime import datetime, timedelta, timezone
 import openpyxl
 import io
@@ -30,7 +30,7 @@ def test_export_user_summary(client, admin_user, user_factory, db):
         event_date=event1_date,
         duration_hours=10.0,
         creator=admin_user,
-        status=UserContinuousTrainingStatus.APPROVED
+        status=ContinuousTrainingEventStatus.APPROVED
     )
     db.session.add(event1)
     db.session.flush() # To get event1.id
@@ -54,7 +54,7 @@ def test_export_user_summary(client, admin_user, user_factory, db):
         event_date=event2_date,
         duration_hours=5.0,
         creator=admin_user,
-        status=UserContinuousTrainingStatus.APPROVED
+        status=ContinuousTrainingEventStatus.APPROVED
     )
     db.session.add(event2)
     db.session.flush() # To get event2.id
@@ -72,35 +72,35 @@ def test_export_user_summary(client, admin_user, user_factory, db):
 
     # Log in as admin
     with client.session_transaction() as sess:
-        sess['user_id'] = admin_user.id
+        sess['_user_id'] = str(admin_user.id)
         sess['_fresh'] = True
 
     # Make the request to the export endpoint
-    response = client.get(url_for('admin.export_user_summary'))
+    with client.application.test_request_context():
+        export_url = url_for('admin.export_user_summary')
+    response = client.get(export_url)
     assert response.status_code == 200
     assert response.headers['Content-Type'] == 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
     assert 'attachment' in response.headers['Content-Disposition']
 
-    # Parse the Excel file
-    workbook = openpyxl.load_workbook(io.BytesIO(response.data))
+    # Parse the Excel file, streaming rows instead of building the full cell graph
+    workbook = openpyxl.load_workbook(io.BytesIO(response.data), read_only=True, data_only=True)
     sheet = workbook.active
+    rows = sheet.iter_rows(values_only=True)
 
     # Get headers
-    headers = [cell.value for cell in sheet[1]]
+    headers = list(next(rows))
     assert "Study Level" in headers
     assert "Total Continuous Training Hours (Last 6 Years)" in headers
+    hx = {header: idx for idx, header in enumerate(headers)}
 
-    # Find the row for the test user
-    user_row = None
-    for row_idx in range(2, sheet.max_row + 1):
-        row_data = [cell.value for cell in sheet[row_idx]]
-        if row_data[headers.index("Email")] == test_user.email:
-            user_row = row_data
-            break
+    # Find the row for the test user, stopping at the first match
+    user_row = next((row_data for row_data in rows if row_data[hx["Email"]] == test_user.email), None)
+    workbook.close()
     
     assert user_row is not None, "Test user not found in the exported summary."
 
     # Assert the values
-    assert user_row[headers.index("Study Level")] == test_user.study_level
+    assert user_row[hx["Study Level"]] == test_user.study_level
     # The total hours should be 10.0 (event1) + 5.0 (event2) = 15.0
-    assert user_row[headers.index("Total Continuous Training Hours (Last 6 Years)")] == 15.0
+    assert user_row[hx["Total Continuous Training Hours (Last 6 Years)"]] == 15.0
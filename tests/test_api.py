@@ -1,31 +1,68 @@
+import types
 import pytest
 from app import db
-from app.models import User, Team, Species, Skill, TrainingPath, TrainingSession, Competency, SkillPracticeEvent, TrainingRequest, ExternalTraining, ExternalTrainingSkillClaim, Complexity, TrainingRequestStatus, ExternalTrainingStatus, Role
+from app.models import User, Team, Species, Skill, TrainingPath, TrainingSession, Competency, SkillPracticeEvent, TrainingRequest, ExternalTraining, ExternalTrainingSkillClaim, Complexity, TrainingRequestStatus, ExternalTrainingStatus
 from datetime import datetime, timedelta, timezone
-import json
-from flask import url_for
-
-def create_api_user():
-    # Ensure the Admin role exists
-    admin_role = Role.query.filter_by(name='Admin').first()
-    if not admin_role:
-        admin_role = Role(name='Admin')
-        db.session.add(admin_role)
-        db.session.commit()
-
+from flask import jsonify, url_for
+from sqlalchemy import select
+
+# Fixed timestamps keep payloads deterministic and avoid formatting them per test
+FIXED_NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+FIXED_NOW_ISO = FIXED_NOW.isoformat()
+FIXED_LATER_ISO = (FIXED_NOW + timedelta(hours=1)).isoformat()
+
+@pytest.fixture(scope='module')
+def api_user_id(app):
+    # Hash the password and commit the row once per module; each test's
+    # SAVEPOINT rollback undoes whatever it does to the user.
     user = User(full_name='API Test User', email='api_test@example.com', is_admin=True, is_approved=True)
     user.set_password('api_password')
     user.generate_api_key()
-    user.roles.append(admin_role)
     db.session.add(user)
+    db.session.flush()
+    # Read the id before committing: touching the expired instance afterwards
+    # would leave a transaction open on the shared connection
+    user_id = user.id
+    db.session.commit()
+    yield user_id
+    db.session.delete(db.session.get(User, user_id))
     db.session.commit()
-    return user
+
+@pytest.fixture(scope='function')
+def api_user(db_session, api_user_id):
+    return db_session.get(User, api_user_id)
+
+@pytest.fixture(scope='function')
+def skill(db_session):
+    # Flushed, not committed: requests share the test connection and see it
+    skill = Skill(name='Shared Skill', complexity=Complexity.SIMPLE)
+    db_session.add(skill)
+    db_session.flush()
+    return skill
+
+@pytest.fixture(scope='function')
+def auth_client(client, api_user):
+    # Every request from this client carries the API user's key
+    client.environ_base['HTTP_X_API_KEY'] = api_user.api_key
+    return client
+
+def login(client, user):
+    # Flask-Login restores the user from the session; no need to post the login form
+    with client.session_transaction() as sess:
+        sess['_user_id'] = str(user.id)
+        sess['_fresh'] = True
+
+def assert_submitted(response):
+    # On a validation failure the route re-renders the form; show it so the field errors are visible
+    assert response.status_code == 200
+    response_data = response.get_json()
+    assert response_data['success'] is True, f"{response_data.get('message')}\n{response_data.get('form_html', '')}"
+    return response_data
 
 
-def test_api_key_authentication(client):
-    user = create_api_user()
+def test_api_key_authentication(client, api_user):
     # Test with valid API key
-    headers = {'X-API-Key': user.api_key}
+    headers = {'X-API-Key': api_user.api_key}
     response = client.get('/api/users/', headers=headers)
     assert response.status_code == 200
 
@@ -38,394 +75,316 @@ def test_api_key_authentication(client):
     response = client.get('/api/users/')
     assert response.status_code == 401
 
-def test_api_get_users(client):
-    user = create_api_user()
-    headers = {'X-API-Key': user.api_key}
-    response = client.get('/api/users/', headers=headers)
+def test_api_get_users(auth_client, api_user):
+    response = auth_client.get('/api/users/')
     assert response.status_code == 200
-    data = json.loads(response.data)
+    data = response.get_json()
     assert len(data) == 1 # Only the api_user exists initially
-    assert data[0]['email'] == user.email
+    assert data[0]['email'] == api_user.email
 
-def test_api_create_user(client):
-    user = create_api_user()
-    headers = {'X-API-Key': user.api_key}
+def test_api_create_user(auth_client):
     user_data = {
         'full_name': 'New API User',
         'email': 'new_api_user@example.com',
         'password': 'new_password',
         'is_admin': False
     }
-    response = client.post('/api/users/', headers=headers, json=user_data)
+    response = auth_client.post('/api/users/', json=user_data)
     assert response.status_code == 201
-    data = json.loads(response.data)
+    data = response.get_json()
     assert data['email'] == 'new_api_user@example.com'
-    assert User.query.filter_by(email='new_api_user@example.com').first() is not None
+    assert db.session.execute(select(User).where(User.email == 'new_api_user@example.com')).scalar_one_or_none() is not None
 
-def test_api_update_user(client):
-    user = create_api_user()
-    headers = {'X-API-Key': user.api_key}
+def test_api_update_user(auth_client, api_user):
     updated_data = {
         'full_name': 'Updated API User',
         'email': 'api_test_updated@example.com',
         'is_admin': True
     }
-    response = client.put(f'/api/users/{user.id}', headers=headers, json=updated_data)
+    response = auth_client.put(f'/api/users/{api_user.id}', json=updated_data)
     assert response.status_code == 200
-    data = json.loads(response.data)
+    data = response.get_json()
     assert data['full_name'] == 'Updated API User'
     assert data['email'] == 'api_test_updated@example.com'
     assert data['is_admin'] is True
 
-def test_api_delete_user(client):
-    user = create_api_user()
-    headers = {'X-API-Key': user.api_key}
+def test_api_delete_user(auth_client):
     user_to_delete = User(full_name='Delete User', email='delete@example.com')
     user_to_delete.set_password('deletepass')
     db.session.add(user_to_delete)
     db.session.commit()
 
-    response = client.delete(f'/api/users/{user_to_delete.id}', headers=headers)
+    response = auth_client.delete(f'/api/users/{user_to_delete.id}')
     assert response.status_code == 204
-    assert User.query.get(user_to_delete.id) is None
+    assert db.session.get(User, user_to_delete.id) is None
 
 # Add tests for other API endpoints (Teams, Species, Skills, etc.)
-def test_api_get_teams(client):
-    user = create_api_user()
-    headers = {'X-API-Key': user.api_key}
-    team = Team(name='Test Team')
-    db.session.add(team)
+@pytest.mark.parametrize('url, make_row, field, expected', [
+    ('/api/teams/', lambda: Team(name='Test Team'), 'name', 'Test Team'),
+    ('/api/species/', lambda: Species(name='Test Species'), 'name', 'Test Species'),
+    ('/api/skills/', lambda: Skill(name='Test Skill', complexity=Complexity.SIMPLE), 'name', 'Test Skill'),
+    ('/api/training_paths/', lambda: TrainingPath(name='Test Path', species=Species(name='Test Species for Path')), 'name', 'Test Path'),
+    ('/api/training_sessions/',
+     lambda: TrainingSession(title='Test Session', start_time=FIXED_NOW, end_time=FIXED_NOW + timedelta(hours=1)),
+     'title', 'Test Session'),
+], ids=['teams', 'species', 'skills', 'training_paths', 'training_sessions'])
+def test_api_list(auth_client, url, make_row, field, expected):
+    db.session.add(make_row())
     db.session.commit()
-    response = client.get('/api/teams/', headers=headers)
+    response = auth_client.get(url)
     assert response.status_code == 200
-    data = json.loads(response.data)
+    data = response.get_json()
     assert len(data) > 0
-    assert data[0]['name'] == 'Test Team'
+    assert data[0][field] == expected
 
-def test_api_create_team(client):
-    user = create_api_user()
-    headers = {'X-API-Key': user.api_key}
-    team_data = {'name': 'New API Team'}
-    response = client.post('/api/teams/', headers=headers, json=team_data)
+@pytest.mark.parametrize('url, payload, field', [
+    ('/api/teams/', {'name': 'New API Team'}, 'name'),
+    ('/api/species/', {'name': 'New API Species'}, 'name'),
+    ('/api/skills/', {'name': 'New API Skill', 'complexity': 'SIMPLE'}, 'name'),
+    ('/api/training_sessions/', {
+        'title': 'New API Session',
+        'start_time': FIXED_NOW_ISO,
+        'end_time': FIXED_LATER_ISO
+    }, 'title'),
+], ids=['teams', 'species', 'skills', 'training_sessions'])
+def test_api_create(auth_client, url, payload, field):
+    response = auth_client.post(url, json=payload)
     assert response.status_code == 201
-    data = json.loads(response.data)
-    assert data['name'] == 'New API Team'
+    data = response.get_json()
+    assert data[field] == payload[field]
 
-def test_api_get_species(client):
-    user = create_api_user()
-    headers = {'X-API-Key': user.api_key}
-    species = Species(name='Test Species')
+def test_api_create_training_path(auth_client):
+    species = Species(name='Test Species for New Path')
     db.session.add(species)
     db.session.commit()
-    response = client.get('/api/species/', headers=headers)
-    assert response.status_code == 200
-    data = json.loads(response.data)
-    assert len(data) > 0
-    assert data[0]['name'] == 'Test Species'
-
-def test_api_create_species(client):
-    user = create_api_user()
-    headers = {'X-API-Key': user.api_key}
-    species_data = {'name': 'New API Species'}
-    response = client.post('/api/species/', headers=headers, json=species_data)
+    path_data = {'name': 'New API Path', 'species_id': species.id}
+    response = auth_client.post('/api/training_paths/', json=path_data)
     assert response.status_code == 201
-    data = json.loads(response.data)
-    assert data['name'] == 'New API Species'
-
-def test_api_get_skills(client):
-    user = create_api_user()
-    headers = {'X-API-Key': user.api_key}
-    skill = Skill(name='Test Skill', complexity=Complexity.SIMPLE)
-    db.session.add(skill)
-    db.session.commit()
-    response = client.get('/api/skills/', headers=headers)
-    assert response.status_code == 200
-    data = json.loads(response.data)
-    assert len(data) > 0
-    assert data[0]['name'] == 'Test Skill'
-
-def test_api_create_skill(client):
-    user = create_api_user()
-    headers = {'X-API-Key': user.api_key}
-    skill_data = {'name': 'New API Skill', 'complexity': 'SIMPLE'}
-    response = client.post('/api/skills/', headers=headers, json=skill_data)
-    assert response.status_code == 201
-    data = json.loads(response.data)
-    assert data['name'] == 'New API Skill'
+    data = response.get_json()
+    assert data['name'] == 'New API Path'
 
-def test_api_get_training_paths(client):
-    user = create_api_user()
-    headers = {'X-API-Key': user.api_key}
-    species = Species(name='Test Species for Path')
-    db.session.add(species)
-    db.session.commit()
-    path = TrainingPath(name='Test Path', species_id=species.id)
-    db.session.add(path)
-    db.session.commit()
-    response = client.get('/api/training_paths/', headers=headers)
-    assert response.status_code == 200
-    data = json.loads(response.data)
-    assert len(data) > 0
-    assert data[0]['name'] == 'Test Path'
-
-    def test_api_create_training_path(client):
-        user = create_api_user()
-        headers = {'X-API-Key': user.api_key}
-        species = Species(name='Test Species for New Path')
-        db.session.add(species)
-        db.session.commit()
-        path_data = {'name': 'New API Path', 'species_id': species.id}
-        response = client.post('/api/training_paths/', headers=headers, json=path_data)
-        assert response.status_code == 201
-        data = json.loads(response.data)
-        assert data['name'] == 'New API Path'
-def test_api_get_training_sessions(client):
-    user = create_api_user()
-    headers = {'X-API-Key': user.api_key}
-    session = TrainingSession(title='Test Session', start_time=datetime.now(timezone.utc), end_time=datetime.now(timezone.utc) + timedelta(hours=1))
-    db.session.add(session)
-    db.session.commit()
-    response = client.get('/api/training_sessions/', headers=headers)
-    assert response.status_code == 200
-    data = json.loads(response.data)
-    assert len(data) > 0
-    assert data[0]['title'] == 'Test Session'
+def test_api_create_training_path_requires_species(auth_client):
+    response = auth_client.post('/api/training_paths/', json={'name': 'Path Without Species'})
+    assert response.status_code == 400
+    assert 'species_id' in response.get_json()['errors']
 
-def test_api_create_training_session(client):
-    user = create_api_user()
-    headers = {'X-API-Key': user.api_key}
-    session_data = {
-        'title': 'New API Session',
-        'start_time': datetime.now(timezone.utc).isoformat(),
-        'end_time': (datetime.now(timezone.utc) + timedelta(hours=1)).isoformat()
-    }
-    response = client.post('/api/training_sessions/', headers=headers, json=session_data)
-    assert response.status_code == 201
-    data = json.loads(response.data)
-    assert data['title'] == 'New API Session'
-
-def test_api_get_competencies(client):
-    user = create_api_user()
-    headers = {'X-API-Key': user.api_key}
-    skill = Skill(name='Competency Skill', complexity=Complexity.SIMPLE)
-    db.session.add(skill)
-    db.session.commit()
-    competency = Competency(user=user, skill=skill, level='Novice')
+def test_api_get_competencies(auth_client, api_user, skill):
+    competency = Competency(user=api_user, skill=skill, level='Novice')
     db.session.add(competency)
     db.session.commit()
-    response = client.get('/api/competencies/', headers=headers)
+    response = auth_client.get('/api/competencies/')
     assert response.status_code == 200
-    data = json.loads(response.data)
+    data = response.get_json()
     assert len(data) > 0
-    assert data[0]['user_id'] == user.id
+    assert data[0]['user_id'] == api_user.id
 
-def test_api_create_competency(client):
-    user = create_api_user()
-    headers = {'X-API-Key': user.api_key}
-    skill = Skill(name='New Competency Skill', complexity=Complexity.SIMPLE)
-    db.session.add(skill)
-    db.session.commit()
+def test_api_create_competency(auth_client, api_user, skill):
     competency_data = {
-        'user_id': user.id,
+        'user_id': api_user.id,
         'skill_id': skill.id,
         'level': 'Expert'
     }
-    response = client.post('/api/competencies/', headers=headers, json=competency_data)
+    response = auth_client.post('/api/competencies/', json=competency_data)
     assert response.status_code == 201
-    data = json.loads(response.data)
+    data = response.get_json()
     assert data['level'] == 'Expert'
 
-def test_api_get_skill_practice_events(client):
-    user = create_api_user()
-    headers = {'X-API-Key': user.api_key}
-    skill = Skill(name='Practice Skill', complexity=Complexity.SIMPLE)
-    db.session.add(skill)
-    db.session.commit()
-    event = SkillPracticeEvent(user=user, notes='notes')
+def test_api_get_skill_practice_events(auth_client, api_user, skill):
+    event = SkillPracticeEvent(user=api_user, notes='notes')
     event.skills.append(skill)
     db.session.add(event)
     db.session.commit()
-    response = client.get('/api/skill_practice_events/', headers=headers)
+    response = auth_client.get('/api/skill_practice_events/')
     assert response.status_code == 200
-    data = json.loads(response.data)
+    data = response.get_json()
     assert len(data) > 0
-    assert data[0]['user_id'] == user.id
+    assert data[0]['user_id'] == api_user.id
 
-def test_api_create_skill_practice_event(client):
-    user = create_api_user()
-    headers = {'X-API-Key': user.api_key}
-    skill = Skill(name='New Practice Skill', complexity=Complexity.SIMPLE)
-    db.session.add(skill)
-    db.session.commit()
+def test_api_create_skill_practice_event(auth_client, api_user, skill):
     event_data = {
-        'user_id': user.id,
+        'user_id': api_user.id,
         'skill_ids': [skill.id],
-        'practice_date': datetime.now(timezone.utc).isoformat(),
+        'practice_date': FIXED_NOW_ISO,
         'notes': 'Practiced well'
     }
-    response = client.post('/api/skill_practice_events/', headers=headers, json=event_data)
+    response = auth_client.post('/api/skill_practice_events/', json=event_data)
     assert response.status_code == 201
-    data = json.loads(response.data)
+    data = response.get_json()
     assert data['notes'] == 'Practiced well'
 
-def test_api_get_training_requests(client):
-    user = create_api_user()
-    headers = {'X-API-Key': user.api_key}
-    skill = Skill(name='Request Skill', complexity=Complexity.SIMPLE)
-    db.session.add(skill)
-    db.session.commit()
-    request_obj = TrainingRequest(requester=user, status=TrainingRequestStatus.PENDING)
+def test_api_get_training_requests(auth_client, api_user, skill):
+    request_obj = TrainingRequest(requester=api_user, status=TrainingRequestStatus.PENDING)
     request_obj.skills_requested.append(skill)
     db.session.add(request_obj)
     db.session.commit()
-    response = client.get('/api/training_requests/', headers=headers)
+    response = auth_client.get('/api/training_requests/')
     assert response.status_code == 200
-    data = json.loads(response.data)
+    data = response.get_json()
     assert len(data) > 0
-    assert data[0]['requester_id'] == user.id
+    assert data[0]['requester_id'] == api_user.id
 
-def test_api_create_training_request(client):
-    user = create_api_user()
-    headers = {'X-API-Key': user.api_key}
-    skill = Skill(name='Another Request Skill', complexity=Complexity.SIMPLE)
-    db.session.add(skill)
-    db.session.commit()
+def test_api_create_training_request(auth_client, api_user, skill):
     request_data = {
-        'requester_id': user.id,
+        'requester_id': api_user.id,
         'skill_ids': [skill.id],
         'status': 'PENDING'
     }
-    response = client.post('/api/training_requests/', headers=headers, json=request_data)
+    response = auth_client.post('/api/training_requests/', json=request_data)
     assert response.status_code == 201
-    data = json.loads(response.data)
-    assert data['status'] == 'TrainingRequestStatus.PENDING'
-
-def test_api_get_external_trainings(client):
-    user = create_api_user()
-    headers = {'X-API-Key': user.api_key}
-    skill = Skill(name='External Training Skill', complexity=Complexity.SIMPLE)
-    db.session.add(skill)
-    db.session.commit()
-    external_training = ExternalTraining(user=user, external_trainer_name='Trainer A', date=datetime.now(timezone.utc), status=ExternalTrainingStatus.PENDING)
+    data = response.get_json()
+    assert data['status'] == TrainingRequestStatus.PENDING.value
+
+@pytest.mark.parametrize('url, make_payload, field, expected', [
+    ('/api/training_requests/', lambda user: {'requester_id': user.id, 'status': 'Proposed Skill'},
+     'status', TrainingRequestStatus.PROPOSED_SKILL),
+    ('/api/skills/', lambda user: {'name': 'Round Trip Skill', 'complexity': 'Moderate'},
+     'complexity', Complexity.MODERATE),
+], ids=['training_request_status', 'skill_complexity'])
+def test_api_enum_value_round_trip(auth_client, api_user, url, make_payload, field, expected):
+    # A value the API returned can be posted back unchanged
+    payload = make_payload(api_user)
+    response = auth_client.post(url, json=payload)
+    assert response.status_code == 201
+    created = response.get_json()
+    assert created[field] == str(expected.value)
+
+    response = auth_client.get(f"{url}{created['id']}")
+    assert response.status_code == 200
+    assert response.get_json()[field] == payload[field]
+
+def test_api_invalid_enum_value(auth_client, api_user):
+    response = auth_client.post('/api/training_requests/', json={'requester_id': api_user.id, 'status': 'Unknown'})
+    assert response.status_code == 400
+
+def test_api_get_external_trainings(auth_client, api_user, skill):
+    external_training = ExternalTraining(user=api_user, external_trainer_name='Trainer A', date=FIXED_NOW, status=ExternalTrainingStatus.PENDING)
     claim = ExternalTrainingSkillClaim(skill=skill, level='Novice')
     external_training.skill_claims.append(claim)
     db.session.add(external_training)
     db.session.commit()
-    response = client.get('/api/external_trainings/', headers=headers)
+    response = auth_client.get('/api/external_trainings/')
     assert response.status_code == 200
-    data = json.loads(response.data)
+    data = response.get_json()
     assert len(data) > 0
-    assert data[0]['user_id'] == user.id
+    assert data[0]['user_id'] == api_user.id
 
-def test_api_create_external_training(client):
-    user = create_api_user()
-    headers = {'X-API-Key': user.api_key}
-    skill = Skill(name='Yet Another External Skill', complexity=Complexity.SIMPLE)
-    db.session.add(skill)
-    db.session.commit()
+def test_api_create_external_training(auth_client, api_user, skill):
     external_training_data = {
-        'user_id': user.id,
+        'user_id': api_user.id,
         'external_trainer_name': 'Trainer B',
-        'date': datetime.now(timezone.utc).isoformat(),
+        'date': FIXED_NOW_ISO,
         'status': 'PENDING',
         'skill_claims': [{'skill_id': skill.id, 'level': 'Expert'}]
     }
-    response = client.post('/api/external_trainings/', headers=headers, json=external_training_data)
+    response = auth_client.post('/api/external_trainings/', json=external_training_data)
     assert response.status_code == 201
-    data = json.loads(response.data)
+    data = response.get_json()
     assert data['external_trainer_name'] == 'Trainer B'
 
-def test_submit_training_request_new(client):
-    user = create_api_user()
+def test_submit_training_request_new(client, api_user, skill):
     # Log in the user
-    client.post('/auth/login', data={'email': user.email, 'password': 'api_password'}, follow_redirects=True)
+    login(client, api_user)
 
-    skill = Skill(name='New Skill for Request', complexity=Complexity.SIMPLE)
     species = Species(name='New Species for Request')
-    db.session.add_all([skill, species])
+    # The skill choices are limited to skills taught on the posted species
+    skill.species.append(species)
+    db.session.add(species)
     db.session.commit()
 
     data = {
         'species': species.id,
         'skills_requested': [skill.id],
+        'justification': 'Needed for an upcoming study.',
         'submit': True
     }
     response = client.post('/dashboard/request-training', data=data, headers={'X-Requested-With': 'XMLHttpRequest'})
-    assert response.status_code == 200
-    response_data = json.loads(response.data)
-    if not response_data['success']:
-        print(f"DEBUG: API call failed. Message: {response_data.get('message')}, Traceback: {response_data.get('traceback')}")
-    assert response_data['success'] is True
+    assert_submitted(response)
     
-    request = TrainingRequest.query.filter_by(requester_id=user.id).first()
+    request = TrainingRequest.query.filter_by(requester_id=api_user.id).first()
     assert request is not None
     assert skill in request.skills_requested
     assert species in request.species_requested
 
-def test_submit_training_request_duplicate(client):
-    user = create_api_user()
-    client.post('/auth/login', data={'email': user.email, 'password': 'api_password'}, follow_redirects=True)
+def test_submit_training_request_duplicate(client, api_user, skill):
+    login(client, api_user)
 
-    skill = Skill(name='Duplicate Skill Request', complexity=Complexity.SIMPLE)
     species = Species(name='Duplicate Species Request')
-    db.session.add_all([skill, species])
-    db.session.commit()
+    skill.species.append(species)
 
     # First request
-    request1 = TrainingRequest(requester=user, status=TrainingRequestStatus.PENDING)
+    request1 = TrainingRequest(requester=api_user, status=TrainingRequestStatus.PENDING)
     request1.skills_requested.append(skill)
     request1.species_requested.append(species)
-    db.session.add(request1)
+    db.session.add_all([species, request1])
     db.session.commit()
 
     data = {
         'species': species.id,
         'skills_requested': [skill.id],
+        'justification': 'Needed for an upcoming study.',
         'submit': True
     }
     response = client.post('/dashboard/request-training', data=data, headers={'X-Requested-With': 'XMLHttpRequest'})
-    assert response.status_code == 200
-    response_data = json.loads(response.data)
-    if not response_data['success']:
-        print(f"DEBUG: API call failed. Message: {response_data.get('message')}, Traceback: {response_data.get('traceback')}")
-    assert response_data['success'] is True
-    assert response_data['message'] == f'Request for "{skill.name}" on "{species.name}" already exists and is pending.'
+    response_data = assert_submitted(response)
+    assert response_data['message'] == f"Request for '{skill.name}' on '{species.name}' already exists and is pending."
 
     # Check that a new request was not created
-    requests = TrainingRequest.query.filter_by(requester_id=user.id).all()
+    requests = TrainingRequest.query.filter_by(requester_id=api_user.id).all()
     assert len(requests) == 1
 
-def test_submit_training_request_update_species(client):
-    user = create_api_user()
-    client.post('/auth/login', data={'email': user.email, 'password': 'api_password'}, follow_redirects=True)
+def test_submit_training_request_update_species(client, api_user, skill):
+    login(client, api_user)
 
-    skill = Skill(name='Update Species Skill', complexity=Complexity.SIMPLE)
     species1 = Species(name='Update Species 1')
     species2 = Species(name='Update Species 2')
-    db.session.add_all([skill, species1, species2])
-    db.session.commit()
+    skill.species.extend([species1, species2])
 
     # First request
-    request1 = TrainingRequest(requester=user, status=TrainingRequestStatus.PENDING)
+    request1 = TrainingRequest(requester=api_user, status=TrainingRequestStatus.PENDING)
     request1.skills_requested.append(skill)
     request1.species_requested.append(species1)
-    db.session.add(request1)
+    db.session.add_all([species1, species2, request1])
     db.session.commit()
 
     data = {
         'species': species2.id,
         'skills_requested': [skill.id],
+        'justification': 'Needed for an upcoming study.',
         'submit': True
     }
     response = client.post('/dashboard/request-training', data=data, headers={'X-Requested-With': 'XMLHttpRequest'})
-    assert response.status_code == 200
-    response_data = json.loads(response.data)
-    if not response_data['success']:
-        print(f"DEBUG: API call failed. Message: {response_data.get('message')}, Traceback: {response_data.get('traceback')}")
-    assert response_data['success'] is True
-    assert response_data['message'] == f'Request for "{skill.name}" on "{species2.name}" created.'
+    response_data = assert_submitted(response)
+    assert response_data['message'] == f"Request for '{skill.name}' on '{species2.name}' created."
 
     # Check that a new request was created, as the logic creates a new one per species
-    requests = TrainingRequest.query.filter_by(requester_id=user.id).all()
+    requests = TrainingRequest.query.filter_by(requester_id=api_user.id).all()
     assert len(requests) == 2
-    assert species2 in requests[1].species_requested
\ No newline at end of file
+    assert species2 in requests[1].species_requested
+
+@pytest.fixture
+def orjson_calls(monkeypatch):
+    # Count the orjson.dumps calls made by the app's JSON provider
+    orjson = pytest.importorskip('orjson')
+    import app as app_module
+    calls = []
+    def dumps(*args, **kwargs):
+        calls.append(args[0])
+        return orjson.dumps(*args, **kwargs)
+    monkeypatch.setattr(app_module, 'orjson', types.SimpleNamespace(
+        **{name: getattr(orjson, name) for name in dir(orjson) if name.startswith('OPT_')},
+        dumps=dumps, loads=orjson.loads))
+    return calls
+
+def test_jsonify_uses_orjson(app, orjson_calls):
+    with app.test_request_context():
+        response = jsonify(b=1, a=[1, 2])
+    assert {'b': 1, 'a': [1, 2]} in orjson_calls
+    assert response.get_data(as_text=True) == '{"a":[1,2],"b":1}\n'
+
+def test_api_response_uses_orjson(auth_client, api_user, orjson_calls):
+    response = auth_client.get(f'/api/users/{api_user.id}')
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['email'] == api_user.email
+    # The marshalled user is what orjson serialised
+    assert any(call.get('email') == api_user.email for call in orjson_calls)
@@ -0,0 +1,24 @@
+from app import db
+from app.models import User
+
+def test_sqlite_pragmas_applied(db_session):
+    connection = db_session.connection()
+    assert connection.exec_driver_sql("PRAGMA synchronous").scalar() == 0
+    assert connection.exec_driver_sql("PRAGMA journal_mode").scalar() == 'memory'
+    assert connection.exec_driver_sql("PRAGMA temp_store").scalar() == 2
+
+def test_savepoint_rollback_isolation(db_session):
+    connection = db_session.connection()
+    assert connection.connection.dbapi_connection.isolation_level is None
+    u = User(full_name='Kept User', email='kept@example.com')
+    u.set_password('password')
+    db.session.add(u)
+    db.session.commit()
+    with db.session.begin_nested() as savepoint:
+        v = User(full_name='Dropped User', email='dropped@example.com')
+        v.set_password('password')
+        db.session.add(v)
+        db.session.flush()
+        savepoint.rollback()
+    assert User.query.filter_by(email='kept@example.com').count() == 1
+    assert User.query.filter_by(email='dropped@example.com').count() == 0
@@ -0,0 +1,189 @@
+import os
+import shutil
+import sys
+import types
+
+import pytest
+
+import manage
+
+
+def _fake_clock(monkeypatch, start=100.0):
+    clock = types.SimpleNamespace(now=start)
+    monkeypatch.setattr(manage, 'time', types.SimpleNamespace(monotonic=lambda: clock.now))
+    return clock
+
+def test_ttl_cache_expires(monkeypatch):
+    clock = _fake_clock(monkeypatch)
+    calls = []
+
+    @manage.ttl_cache(5)
+    def probe():
+        calls.append(clock.now)
+        return len(calls)
+
+    assert probe() == 1
+    clock.now += 4.9
+    assert probe() == 1
+    clock.now += 0.2
+    assert probe() == 2
+    assert probe() == 2
+
+def test_ttl_cache_keys_on_arguments(monkeypatch):
+    _fake_clock(monkeypatch)
+    calls = []
+
+    @manage.ttl_cache(60)
+    def status(config=None, verbose=False):
+        calls.append((config, verbose))
+        return len(calls)
+
+    assert status({'APP_PORT': '5001'}) == 1
+    assert status({'APP_PORT': '5001'}) == 1
+    assert status({'APP_PORT': '5002'}) == 2
+    assert status(config={'APP_PORT': '5001'}) == 3
+    assert status({'APP_PORT': '5001'}, verbose=True) == 4
+    assert status({'APP_PORT': '5001'}, verbose=True) == 4
+    assert status() == 5
+
+def test_ttl_cache_clear(monkeypatch):
+    _fake_clock(monkeypatch)
+    calls = []
+
+    @manage.ttl_cache(60)
+    def probe():
+        calls.append(None)
+        return len(calls)
+
+    assert probe() == 1
+    probe.cache_clear()
+    assert probe() == 2
+
+def test_ask_prompts_and_falls_back_to_default(monkeypatch):
+    replies = iter(['  typed  ', ''])
+    monkeypatch.setattr('builtins.input', lambda message: next(replies))
+    assert manage.ask("Port: ", "5001") == 'typed'
+    assert manage.ask("Port: ", "5001") == '5001'
+
+def test_ask_reads_answers_without_prompting(monkeypatch):
+    monkeypatch.setattr('builtins.input', lambda message: pytest.fail("prompted in unattended mode"))
+    answers = {'APP_PORT': ' 5005 '}
+    assert manage.ask("Port: ", "5001", 'APP_PORT', answers) == '5005'
+    assert manage.ask("Email: ", "admin@example.com", 'ADMIN_EMAIL', answers) == 'admin@example.com'
+    assert manage.ask("Choice: ", "1", answers=answers) == '1'
+
+def test_load_file_parses_key_value_lines(tmp_path):
+    path = tmp_path / 'answers.env'
+    path.write_text(
+        "# comment\n"
+        "\n"
+        "APP_PORT = 5005\n"
+        "DATABASE_URL=mysql://u:p@h/db?x=1\n"
+        "not a setting\n"
+        "  # indented comment\n"
+        "EMPTY=\n"
+    )
+    assert manage.ConfigManager.load_file(path) == {
+        'APP_PORT': '5005',
+        'DATABASE_URL': 'mysql://u:p@h/db?x=1',
+        'EMPTY': '',
+    }
+
+@pytest.fixture
+def setup_dir(tmp_path, monkeypatch):
+    # Run the wizard against a scratch copy of env-sample with every port free
+    shutil.copy(os.path.join(os.path.dirname(manage.__file__), manage.ENV_SAMPLE), tmp_path / manage.ENV_SAMPLE)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(manage.ConfigManager, '_env_cache', {'stamp': None, 'data': None})
+    monkeypatch.setattr(manage.PortManager, 'check_port_available', staticmethod(lambda port, host='localhost': True))
+    return tmp_path
+
+def test_setup_non_interactive_uses_defaults(setup_dir):
+    manage.setup_env_file({})
+    config = manage.ConfigManager.load_file(manage.ENV_FILE)
+    assert config['DEPLOYMENT_MODE'] == 'docker'
+    assert config['APP_PORT'] == '5001'
+    assert config['DB_HOST'] == 'db'
+    assert config['MAIL_SERVER'] == ''
+    assert len(config['SECRET_KEY']) == 64
+    assert config['SECRET_KEY'] != config['SERVICE_API_KEY']
+
+def test_setup_non_interactive_refuses_to_overwrite(setup_dir):
+    (setup_dir / manage.ENV_FILE).write_text("SECRET_KEY=existing\n")
+    manage.setup_env_file({'APP_PORT': '5005'})
+    assert (setup_dir / manage.ENV_FILE).read_text() == "SECRET_KEY=existing\n"
+
+def test_setup_force_keeps_secrets_and_backs_up(setup_dir):
+    (setup_dir / manage.ENV_FILE).write_text("SECRET_KEY=existing\nDB_PASSWORD=db-secret\n")
+    manage.setup_env_file({'APP_PORT': '5005'}, force=True)
+    config = manage.ConfigManager.load_file(manage.ENV_FILE)
+    assert config['APP_PORT'] == '5005'
+    assert config['SECRET_KEY'] == 'existing'
+    assert config['DB_PASSWORD'] == 'db-secret'
+    backups = list(setup_dir.glob(manage.ENV_FILE + '.backup.*'))
+    assert len(backups) == 1
+    assert backups[0].read_text() == "SECRET_KEY=existing\nDB_PASSWORD=db-secret\n"
+
+def test_setup_command_reads_config_file(tmp_path, monkeypatch):
+    answers_file = tmp_path / 'answers.env'
+    answers_file.write_text("APP_PORT=5005\n# comment\n")
+    calls = []
+    monkeypatch.setattr(manage, 'setup_env_file', lambda answers, force=False: calls.append((answers, force)))
+    monkeypatch.setattr(sys, 'argv', ['manage.py', 'setup', '--config-file', str(answers_file), '--force'])
+    manage.main()
+    monkeypatch.setattr(sys, 'argv', ['manage.py', 'setup', '--non-interactive'])
+    manage.main()
+    assert calls == [({'APP_PORT': '5005'}, True), ({}, False)]
+
+@pytest.mark.parametrize('content, expected', [
+    (b''.join(b'line %d\n' % i for i in range(15)), b''.join(b'line %d\n' % i for i in range(5, 15))),
+    (b'a\nb\nc', b'a\nb\nc'),
+    (b''.join(b'%d\n' % i for i in range(12)) + b'partial', b''.join(b'%d\n' % i for i in range(3, 12)) + b'partial'),
+    (b'x' * 5000 + b'\n' + b''.join(b'y' * 3000 + b'\n' for _ in range(10)), b''.join(b'y' * 3000 + b'\n' for _ in range(10))),
+    (b'', b''),
+], ids=['trailing_newline', 'short_file', 'no_trailing_newline', 'spans_blocks', 'empty'])
+def test_tail_offset_starts_at_last_ten_lines(tmp_path, content, expected):
+    path = tmp_path / 'app.log'
+    path.write_bytes(content)
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        assert content[manage._tail_offset(fd):] == expected
+    finally:
+        os.close(fd)
+
+def test_docker_ping_defers_to_cli_without_socket(tmp_path, monkeypatch):
+    monkeypatch.delenv('DOCKER_HOST', raising=False)
+    monkeypatch.setattr(manage, 'DOCKER_SOCKET', str(tmp_path / 'docker.sock'))
+    monkeypatch.setattr(manage, 'DOCKER_PIPE', str(tmp_path / 'docker_engine'))
+    assert manage._docker_ping() is None
+
+@pytest.mark.skipif(os.name == 'nt', reason='Unix socket probe')
+def test_docker_ping_reports_refused_socket(tmp_path, monkeypatch):
+    import socket
+    path = str(tmp_path / 'docker.sock')
+    # Bound but not listening: the socket file exists and connections are refused
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.bind(path)
+        monkeypatch.delenv('DOCKER_HOST', raising=False)
+        monkeypatch.setattr(manage, 'DOCKER_SOCKET', path)
+        assert manage._docker_ping() is False
+
+def test_docker_daemon_running_falls_back_to_cli(monkeypatch):
+    calls = []
+    monkeypatch.setattr(manage, '_docker_ping', lambda: None)
+    monkeypatch.setattr(manage.subprocess, 'run', lambda cmd, **kwargs: calls.append(cmd))
+    manage.docker_daemon_running.cache_clear()
+    try:
+        assert manage.docker_daemon_running() is True
+    finally:
+        manage.docker_daemon_running.cache_clear()
+    assert calls == [["docker", "info"]]
+
+def test_wait_port_free_waits_for_listener():
+    import socket
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as listener:
+        listener.bind(('0.0.0.0', 0))
+        listener.listen()
+        port = listener.getsockname()[1]
+        assert manage._wait_port_free(port, timeout=0.1) is False
+    assert manage._wait_port_free(port, timeout=1) is True